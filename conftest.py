@@ -1,4 +1,5 @@
 import os
+import re
 import shutil
 import time
 
@@ -6,14 +7,28 @@ import pytest
 from playwright.sync_api import sync_playwright
 from pytest_metadata.plugin import metadata_key
 
-from features.utils.config_manager import ConfigManager, is_ci
+from features.forms.login.login_page import LoginPage
+from features.utils.auth_manager import AuthManager
+from features.utils.config_manager import ConfigManager, is_ci, get_worker_id, is_controller
+from features.utils.content_index_manager import ContentIndexManager
+from features.utils.context_pool_manager import ContextPoolManager
+from features.utils.download_manager import DownloadManager
+from features.utils.excel_manager import ExcelManager, load_test_data
 from features.utils.log_manager import LogManager
+from features.utils.navigation_manager import NavigationManager
 from features.utils.report_manager import ReportManager
+from features.utils.route_manager import RouteManager
+from features.utils.trace_manager import TraceManager
 
 obj_config = ConfigManager()
-logger = LogManager().get_logger()
+log_manager = LogManager()
+logger = log_manager.get_logger()
 report_manager = ReportManager()
+route_manager = RouteManager()
+trace_manager = TraceManager()
+download_manager = DownloadManager()
 bool_is_ci_env = is_ci()
+dict_collection_timings = {}
 
 
 @pytest.hookimpl
@@ -21,7 +36,7 @@ def pytest_configure(config: pytest.Config):
     config.option.htmlpath = obj_config.html_report_path
     if not bool_is_ci_env:
         config.option.allure_report_dir = obj_config.allure_results_path
-    config.option.self_contained_html = True
+    config.option.self_contained_html = obj_config.get("HTML_REPORT_MODE") != "assets"
     config.option.disable_warnings = True
     config.option.strict_markers = True
     config.option.reruns = 0
@@ -39,10 +54,14 @@ def pytest_html_report_title(report):
 
 @pytest.hookimpl
 def pytest_sessionstart(session: pytest.Session):
+    if not is_controller(session.config):
+        return
     network_call_logs = obj_config.network_calls_path
     if os.path.exists(network_call_logs):
         with open(network_call_logs, "w", encoding="utf-8") as f:
             f.write("")
+    for str_part in report_manager.network_call_parts() + log_manager.worker_log_files() + download_manager.manifest_parts():
+        os.remove(str_part)
     str_report_dir = obj_config.report_path
     if not bool_is_ci_env:
         shutil.rmtree(str_report_dir, ignore_errors=True)
@@ -70,45 +89,169 @@ def browser():
         logger.info("Browser closed")
 
 
+@pytest.hookimpl
+def pytest_generate_tests(metafunc: pytest.Metafunc):
+    # @pytest.mark.test_data("file.xlsx", "Sheet", argname="COLUMN", ...) parametrizes from a cached, pandas-free read
+    marker = metafunc.definition.get_closest_marker("test_data")
+    if marker is None:
+        return
+    str_file_name, str_sheet_name = marker.args
+    dict_columns = marker.kwargs
+    rows = load_test_data(str_file_name, str_sheet_name, tuple(dict_columns.values()))
+    list_columns = list(dict_columns.values())
+    if len(list_columns) == 1:
+        # a single argname takes bare values; a 1-tuple would reach the test as the argument itself
+        list_values = [row[list_columns[0]] for row in rows]
+    else:
+        list_values = [tuple(row[column] for column in list_columns) for row in rows]
+    metafunc.parametrize(", ".join(dict_columns), list_values)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector: pytest.Collector):
+    float_start = time.perf_counter()
+    yield
+    if isinstance(collector, pytest.Module):
+        dict_collection_timings[collector.nodeid] = time.perf_counter() - float_start
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session: pytest.Session):
+    float_start = time.perf_counter()
+    yield
+    str_modules = ", ".join(f"{nodeid}={seconds * 1000:.0f} ms" for nodeid, seconds in dict_collection_timings.items())
+    logger.info(f"Collected {len(session.items)} tests in {(time.perf_counter() - float_start) * 1000:.0f} ms "
+                f"(module import and collection: {str_modules or 'none'})")
+
+
+@pytest.hookimpl
+def pytest_runtest_setup(item: pytest.Item):
+    log_manager.set_context(test_id=item.nodeid, step=None)
+
+
+@pytest.hookimpl
+def pytest_bdd_before_step(request, feature, scenario, step, step_func):
+    log_manager.set_context(step=step.name)
+
+
 @pytest.hookimpl
 def pytest_bdd_before_scenario(request, feature, scenario):
     report_manager.skip_scenarios_in_report(feature, scenario)
 
 
-@pytest.fixture(scope="function")
-def page(browser, request):
+def artifact_path(directory, request, extension, prefix=""):
+    # the nodeid, unlike the test name, is unique across modules and parametrizations
+    str_name = re.sub(r"[^\w.-]+", "_", request.node.nodeid).strip("_")
+    return os.path.join(directory, f"{prefix}{str_name}{extension}")
+
+
+def context_options():
     headless = obj_config.get("HEADLESS")
-    int_wait_time = int(obj_config.get("STATIC_WAIT"))
-    width = int(obj_config.get("VIEWPORT_WIDTH"))
-    height = int(obj_config.get("VIEWPORT_HEIGHT"))
+    width = obj_config.get("VIEWPORT_WIDTH")
+    height = obj_config.get("VIEWPORT_HEIGHT")
     viewport = {"width": width, "height": height} if headless else None
     no_viewport = not headless
     record_video_size = {"width": width, "height": height} if not bool_is_ci_env else None
-    record_video_dir = obj_config.video_path if not bool_is_ci_env else None
-    context = browser.new_context(no_viewport=no_viewport, viewport=viewport, record_video_dir=record_video_dir, record_video_size=record_video_size)
-    logger.info("New browser context created")
+    record_video_dir = os.path.join(obj_config.video_path, get_worker_id()) if not bool_is_ci_env else None
+    return {"no_viewport": no_viewport, "viewport": viewport, "record_video_dir": record_video_dir, "record_video_size": record_video_size}
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser):
+    if not obj_config.get("CONTEXT_POOL"):
+        yield None
+        return
+    pool = ContextPoolManager(browser, context_options(), obj_config.get("CONTEXT_POOL_SIZE"))
+    pool.warm_up()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def auth_manager():
+    manager = AuthManager()
+    yield manager
+    manager.log_stats()
+
+
+@pytest.fixture
+def credentials(request):
+    params = getattr(request.node, "callspec", None)
+    if params and {"username", "password"} <= params.params.keys():
+        return params.params["username"], params.params["password"]
+    data = load_test_data("creds.xlsx", "Sheet1", ("VALID_USERNAME", "VALID_PASSWORD"))[0]
+    return data["VALID_USERNAME"], data["VALID_PASSWORD"]
+
+
+def login_and_save_state(browser, username, password, path):
+    options = {**context_options(), "record_video_dir": None, "record_video_size": None}
+    context = browser.new_context(**options)
+    try:
+        if not LoginPage(context.new_page()).login(username, password):
+            raise Exception(f"Login failed for {username}, storage state not saved")
+        context.storage_state(path=path)
+    finally:
+        context.close()
+
+
+@pytest.fixture(scope="function")
+def page(browser, context_pool, auth_manager, request):
+    bool_authenticated = request.node.get_closest_marker("authenticated") is not None
+    context_pool = None if bool_authenticated else context_pool
+    if bool_authenticated:
+        username, password = request.getfixturevalue("credentials")
+        str_state_path = auth_manager.get_storage_state(username, password,
+                                                        lambda u, p, path: login_and_save_state(browser, u, p, path))
+        context = browser.new_context(**context_options(), storage_state=str_state_path)
+        logger.info(f"New browser context created with the storage state of {username}")
+    elif context_pool:
+        context = context_pool.acquire()
+        logger.info("Browser context acquired from the pool")
+    else:
+        context = browser.new_context(**context_options())
+        logger.info("New browser context created")
+    route_manager.apply(context)
     page = context.new_page()
+    request.node.stash[ReportManager.PAGE_KEY] = page
     logger.info("New page created in the browser context")
-    if not bool_is_ci_env:
-        context.tracing.start(screenshots=True, snapshots=True, sources=True)
-        logger.info("Tracing started for the context")
+    bool_tracing = trace_manager.should_trace()
+    if bool_tracing:
+        trace_manager.start(context, request.node.name)
     try:
         yield page
     finally:
+        float_teardown_start = time.perf_counter()
+        str_trace_path = None
+        str_video_path = None
+        report = getattr(request.node, "rep_call", None)
+        bool_failed = report is None or report.failed
         try:
-            if not bool_is_ci_env:
-                context.tracing.stop(path=obj_config.trace_path)
-                logger.info("Tracing stopped for the context")
+            if bool_tracing:
+                str_trace_name, str_trace_extension = os.path.splitext(os.path.basename(obj_config.trace_path))
+                str_trace_path = trace_manager.stop(context, artifact_path(os.path.dirname(obj_config.trace_path), request, str_trace_extension,
+                                                                           f"{str_trace_name}-"), bool_failed)
         except Exception as e:
             logger.error(f"Failed to stop tracing: {e}")
-        try:
-            context.close()
-        except Exception as e:
-            logger.error(f"Failed to close context: {e}")
+        if context_pool:
+            context_pool.release(context, dirty=bool_failed)
+            if page.video:
+                # a pooled context outlives the page, so wait for this page's video explicitly
+                str_video_path = artifact_path(context_options()["record_video_dir"], request, ".webm")
+                page.video.save_as(str_video_path)
+                page.video.delete()
+        else:
+            try:
+                context.close()
+            except Exception as e:
+                logger.error(f"Failed to close context: {e}")
+            # the video is guaranteed to be written once its context is closed
+            str_video_path = page.video.path() if page.video else None
 
+        report_manager.screenshot_manager.flush(request.node.nodeid)
+        report_manager.attach_network_summary(request.node.nodeid)
         if not bool_is_ci_env:
-            time.sleep(int_wait_time)
-            report_manager.attach_video_to_report()
+            report_manager.attach_video_to_report(str_video_path, str_trace_path, bool_failed)
+        logger.info(f"Teardown for {request.node.name} finished in {(time.perf_counter() - float_teardown_start) * 1000:.0f} ms")
 
 
 def allure_labels(suite, feature, story, *tags):
@@ -130,10 +273,24 @@ def pytest_bdd_step_error(request, feature, scenario, step, step_func, step_func
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call: pytest.CallInfo):
     outcome = yield
-    report_manager.attach_screenshot_to_report(outcome, call)
+    setattr(item, f"rep_{call.when}", outcome.get_result())
+    report_manager.attach_screenshot_to_report(item, outcome, call)
 
 
-@pytest.hookimpl
+@pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session: pytest.Session, exitstatus):
+    ExcelManager.flush_all()
+    report_manager.dump_network_calls()
+    route_manager.log_stats()
+    trace_manager.log_stats()
+    ContentIndexManager().log_stats()
+    NavigationManager().log_stats()
+    report_manager.screenshot_manager.close()
+    # last worker-side call: the controller merges, then deletes, the per-worker log files once this returns
+    log_manager.flush()
+    if not is_controller(session.config):
+        return
     report_manager.write_network_calls_to_html()
+    log_manager.merge_worker_logs()
+    download_manager.merge_manifest()
     report_manager.run_report()
@@ -1,26 +1,67 @@
-import os
+import re
 import time
 from datetime import datetime as dt
+from types import ModuleType
 from typing import Literal
 
-import PyPDF2
-import pandas as pd
-from docx import Document
-from openpyxl.utils.exceptions import InvalidFileException
-from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, Page, Locator, expect, Position
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError, Page, Locator, expect, Position
 
 from features.utils.config_manager import ConfigManager
+from features.utils.content_index_manager import ContentIndex, ContentIndexManager
+from features.utils.docx_manager import DocxManager
+from features.utils.download_manager import DownloadManager
 from features.utils.log_manager import LogManager
+from features.utils.navigation_manager import NavigationManager
+from features.utils.pdf_manager import PdfManager
+from features.utils.spreadsheet_manager import SpreadsheetManager
 
 
 class BasePage:
+    BATCH_STATE_JS = """({items, settle}) => {
+        // like playwright's css engine, look inside open shadow roots when the light dom has no match
+        const queryDeep = (root, selector) => {
+            const found = root.querySelector(selector);
+            if (found) return found;
+            for (const host of root.querySelectorAll("*")) {
+                const nested = host.shadowRoot ? queryDeep(host.shadowRoot, selector) : null;
+                if (nested) return nested;
+            }
+            return null;
+        };
+        const results = items.map(([selector, kind, state]) => {
+            let element;
+            try {
+                element = kind === "xpath"
+                    ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+                    : queryDeep(document, selector);
+            } catch (e) {
+                // playwright-only css (:has-text, :visible, css=...) is not valid for the dom apis
+                return {ok: false, invalid: true, attached: false, visible: false};
+            }
+            let visible = false;
+            if (element) {
+                const rect = element.getBoundingClientRect();
+                visible = rect.width > 0 && rect.height > 0 && getComputedStyle(element).visibility !== "hidden";
+            }
+            const ok = {attached: !!element, detached: !element, visible: visible, hidden: !visible}[state];
+            return {ok: ok, invalid: false, attached: !!element, visible: visible};
+        });
+        return !settle || results.every(result => result.ok || result.invalid) ? results : false;
+    }"""
+    # floor for the per-selector re-check after a batch has used up the timeout, so playwright still gets one look
+    RECHECK_TIMEOUT = 500
 
     def __init__(self, page: Page):
         self.page = page
         self.config = ConfigManager()
-        self.log = LogManager().get_logger()
+        self.log = LogManager(__name__).get_logger()
+        self.wait_log = LogManager(f"{__name__}.wait").get_logger()
         self.str_last_exported_file = None
-        self.timeout = int(self.config.get("DYNAMIC_WAIT"))  # in milliseconds
+        self.str_last_exported_hash = None
+        self.download_manager = DownloadManager()
+        self.navigation = NavigationManager()
+        self.list_wait_timings = []
+        self.timeout = self.config.get("DYNAMIC_WAIT")  # in milliseconds
 
     def _get_locator(self, pstr_selector: str | Locator):
         try:
@@ -36,22 +77,47 @@ class BasePage:
             raise Exception(f"Error getting locator for {pstr_selector}") from e
 
     def load_page_with_retry(self, pstr_url: str, pstr_locator: str):
-        int_retries = int(self.config.get("RETRY_ATTEMPTS"))
+        # RETRY_ATTEMPTS counts total attempts; a page is always tried at least once
+        int_retries = max(1, self.config.get("RETRY_ATTEMPTS"))
+        if self.navigation.is_open(pstr_url):
+            self.log.error(f"Not loading {pstr_url}: circuit breaker is open for {self.navigation.host(pstr_url)}")
+            return False
         for attempt in range(int_retries):
+            float_start = time.perf_counter()
+            float_goto = 0.0
+            str_phase = "goto"
             try:
                 self.log.info(f"Navigating to {pstr_url} (attempt {attempt + 1}/{int_retries})")
                 self.page.goto(url=pstr_url, timeout=self.timeout)
-                self.page.wait_for_load_state("domcontentloaded", timeout=self.timeout)
-                if not self.wait_for_element(pstr_locator, pint_timeout=self.timeout):
+                # one DYNAMIC_WAIT per attempt: each later wait only gets what the previous steps left over
+                int_remaining = max(1, self.timeout - int((time.perf_counter() - float_start) * 1000))
+                self.page.wait_for_load_state("domcontentloaded", timeout=int_remaining)
+                float_goto = time.perf_counter() - float_start
+                str_phase = "wait"
+                int_remaining = max(1, self.timeout - int(float_goto * 1000))
+                if not self.wait_for_element(pstr_locator, pint_timeout=int_remaining):
                     raise PlaywrightTimeoutError(f"Locator {pstr_locator} not found after navigation")
+                self.navigation.host_reached(pstr_url)
+                self.navigation.record(pstr_url, attempt + 1, "ok", float_goto, time.perf_counter() - float_start - float_goto)
                 self.log.info(f"Successfully loaded {pstr_url}")
                 return True
             except PlaywrightTimeoutError as e:
                 self.log.error(f"Timeout after attempt {attempt + 1} or error after navigation: {e}")
             except Exception as e:
                 self.log.error(f"Error loading {pstr_url} on attempt {attempt + 1}: {e}")
-            self.static_wait_with_polling()
-        self.log.error(f"Failed to load {pstr_url} after {int_retries} attempts")
+            float_elapsed = time.perf_counter() - float_start
+            if str_phase == "goto":
+                float_goto = float_elapsed
+                self.navigation.host_failed(pstr_url)
+            else:
+                self.navigation.host_reached(pstr_url)
+            bool_retry = attempt + 1 < int_retries and not self.navigation.is_open(pstr_url) and self.navigation.take_retry()
+            float_backoff = self.navigation.backoff(attempt) if bool_retry else 0.0
+            self.navigation.record(pstr_url, attempt + 1, f"{str_phase} failed", float_goto, float_elapsed - float_goto, float_backoff)
+            if not bool_retry:
+                break
+            time.sleep(float_backoff)
+        self.log.error(f"Failed to load {pstr_url} after {attempt + 1} attempts")
         return False
 
     def get_title(self):
@@ -186,47 +252,100 @@ class BasePage:
     def wait_for_element(self, pstr_selector: str | Locator, literal_state: Literal["attached", "detached", "hidden", "visible"] = "visible",
                          pint_timeout: int = None):
         int_timeout = pint_timeout if pint_timeout else self.timeout
+        str_state = literal_state or "visible"
+        float_start = time.perf_counter()
         try:
             locator = self._get_locator(pstr_selector)
-            if not literal_state:
-                locator.first.wait_for(timeout=int_timeout)
-            else:
-                locator.first.wait_for(state=literal_state, timeout=int_timeout)
-            self.static_wait_with_polling(pstr_selector, literal_state=literal_state)
+            locator.first.wait_for(state=str_state, timeout=int_timeout)
+            float_elapsed = self._record_wait(pstr_selector, str_state, float_start, True)
+            self.wait_log.info(f"Element '{pstr_selector}' is {str_state} after {float_elapsed:.0f} ms")
             return True
         except PlaywrightTimeoutError as e:
-            self.log.error(f"Timeout: Element '{pstr_selector}' not found within {int_timeout} ms: {e}")
+            self._record_wait(pstr_selector, str_state, float_start, False)
+            self.log.error(f"Timeout: Element '{pstr_selector}' not {str_state} within {int_timeout} ms: {e}")
             return False
         except Exception as e:
+            self._record_wait(pstr_selector, str_state, float_start, False)
             self.log.error(f"Element '{pstr_selector}' not found: {e}")
             return False
 
+    @staticmethod
+    def _selector_items(selectors, literal_state: str) -> dict[str, str]:
+        # accepts {selector: state}, a list of selectors, or a locators module: its UPPER_CASE string constants,
+        # minus the names listed in the module's optional __non_selectors__ (e.g. ENDPOINT)
+        if isinstance(selectors, ModuleType):
+            tuple_skip = getattr(selectors, "__non_selectors__", ())
+            return {value: literal_state for name, value in vars(selectors).items()
+                    if name.isupper() and isinstance(value, str) and name not in tuple_skip}
+        if isinstance(selectors, dict):
+            return {selector: state or literal_state for selector, state in selectors.items()}
+        return {selector: literal_state for selector in selectors}
+
+    def wait_for_elements(self, selectors, literal_state: Literal["attached", "detached", "hidden", "visible"] = "visible",
+                          pint_timeout: int = None) -> dict[str, dict]:
+        int_timeout = pint_timeout if pint_timeout else self.timeout
+        dict_states = self._selector_items(selectors, literal_state)
+        # css and xpath settle together in the page; other selector engines only exist in playwright, so they wait one by one
+        list_batched = [selector for selector in dict_states if not self._is_engine_selector(selector)]
+        list_items = [[selector[len("xpath="):] if selector.startswith("xpath=") else selector,
+                       "xpath" if selector.startswith(("//", "(//", "xpath=")) else "css", dict_states[selector]]
+                      for selector in list_batched]
+        float_start = time.perf_counter()
+        dict_results = {}
+        if list_items:
+            try:
+                try:
+                    handle = self.page.wait_for_function(self.BATCH_STATE_JS, arg={"items": list_items, "settle": True}, timeout=int_timeout,
+                                                         polling="raf")
+                    list_results = handle.json_value()
+                except PlaywrightTimeoutError:
+                    list_results = self.page.evaluate(self.BATCH_STATE_JS, {"items": list_items, "settle": False})
+                # only settled results are final: invalid selectors and any the dom apis could not resolve
+                # (e.g. css combinators crossing a shadow boundary) are re-checked with playwright's own engine
+                dict_results.update({selector: {"state": dict_states[selector], **result}
+                                     for selector, result in zip(list_batched, list_results) if result["ok"]})
+            except PlaywrightError as e:
+                self.log.error(f"Batch wait failed, waiting for elements one by one: {e}")
+        for selector, state in dict_states.items():
+            if selector not in dict_results:
+                int_remaining = max(self.RECHECK_TIMEOUT, int_timeout - int((time.perf_counter() - float_start) * 1000))
+                bool_ok = self.wait_for_element(selector, literal_state=state, pint_timeout=int_remaining)
+                dict_results[selector] = {"state": state, "ok": bool_ok}
+        bool_success = all(result["ok"] for result in dict_results.values())
+        float_elapsed = self._record_wait(f"batch of {len(dict_results)}", "mixed", float_start, bool_success)
+        list_failed = [selector for selector, result in dict_results.items() if not result["ok"]]
+        self.wait_log.info(f"{len(dict_results) - len(list_failed)}/{len(dict_results)} elements settled after {float_elapsed:.0f} ms"
+                           + (f", not settled: {list_failed}" if list_failed else ""))
+        return {selector: dict_results[selector] for selector in dict_states}
+
+    def assert_elements(self, selectors, literal_state: Literal["attached", "detached", "hidden", "visible"] = "visible",
+                        pint_timeout: int = None) -> dict[str, dict]:
+        dict_results = self.wait_for_elements(selectors, literal_state, pint_timeout)
+        dict_failed = {selector: result for selector, result in dict_results.items() if not result["ok"]}
+        if dict_failed:
+            self.log.error(f"Elements not in the expected state: {dict_failed}")
+            raise AssertionError(f"Elements not in the expected state: {dict_failed}")
+        return dict_results
+
+    @staticmethod
+    def _is_engine_selector(pstr_selector: str | Locator) -> bool:
+        if not isinstance(pstr_selector, str):
+            return True
+        return bool(re.match(r"^(text|id|data-testid|internal:[\w-]+|role|nth|visible)=", pstr_selector)) or ">>" in pstr_selector
+
+    def _record_wait(self, pstr_selector: str | Locator, pstr_state: str, pfloat_start: float, pbool_success: bool):
+        float_elapsed = (time.perf_counter() - pfloat_start) * 1000
+        self.list_wait_timings.append({"selector": str(pstr_selector), "state": pstr_state, "elapsed_ms": round(float_elapsed, 1),
+                                       "success": pbool_success})
+        return float_elapsed
+
     def static_wait_with_polling(self, pstr_selector: Locator | str = None,
                                  literal_state: Literal["attached", "detached", "hidden", "visible"] = "visible"):
         if not pstr_selector:
-            int_static_wait_time = int(self.config.get("STATIC_WAIT"))
+            int_static_wait_time = self.config.get("STATIC_WAIT")
             time.sleep(int_static_wait_time)
             return True
-        locator = self._get_locator(pstr_selector)
-        end_time = time.time() + self.timeout / 1000
-        while time.time() < end_time:
-            try:
-                if literal_state == "visible" and locator.first.is_visible(timeout=self.timeout):
-                    self.log.info(f"Element {pstr_selector} is visible after waiting.")
-                    return True
-                elif literal_state == "attached" and locator.count() >= 1:
-                    self.log.info(f"Element {pstr_selector} is attached after waiting.")
-                    return True
-                elif literal_state == "detached" and locator.count() == 0:
-                    self.log.info(f"Element {pstr_selector} is detached after waiting.")
-                    return True
-                elif literal_state == "hidden" and locator.first.is_hidden():
-                    self.log.info(f"Element {pstr_selector} is hidden after waiting.")
-                    return True
-            except PlaywrightTimeoutError as e:
-                self.log.error(f"Error while waiting for element {pstr_selector}: {e}")
-            time.sleep(1)
-        return False
+        return self.wait_for_element(pstr_selector, literal_state=literal_state)
 
     def hover(self, pstr_selector: str | Locator, position: dict[str, int] | None = None):
         try:
@@ -284,8 +403,7 @@ class BasePage:
             if locator is None:
                 self.log.error(f"Locator for '{pstr_selector}' is None.")
                 return False
-            self.static_wait_with_polling(locator)
-            if locator.is_visible(timeout=self.timeout):
+            if self.wait_for_element(locator):
                 self.log.info(f"Element '{pstr_selector}' is visible.")
                 return True
             self.log.error(f"Timeout: Element '{pstr_selector}' not visible within {self.timeout} ms.")
@@ -360,26 +478,45 @@ class BasePage:
             raise Exception(f"Error handling dialog: {e}") from e
 
     def download_file(self, pstr_locator: str, file_type: str = "xlsx"):
+        return self.download_files([pstr_locator], file_type)[0]
+
+    def download_files(self, list_locators: list[str], file_type: str | None = "xlsx") -> list[str]:
+        # every click only waits for its download to start, so the files transfer concurrently and are saved as each completes
         try:
-            str_export_folder = self.config.exports_path
-            str_filename = dt.now().strftime('%Y_%m_%d_%H_%M_%S')
-            self.str_last_exported_file = os.path.join(str_export_folder, f"{str_filename}.{file_type}")
-            with self.page.expect_download(timeout=self.timeout) as download_info:
-                self.click(pstr_locator)
-                self.static_wait_with_polling()
-            download = download_info.value
-            download.save_as(self.str_last_exported_file)
+            list_started = []
+            for str_locator in list_locators:
+                float_started = time.perf_counter()
+                with self.page.expect_download(timeout=self.timeout) as download_info:
+                    self.click(str_locator)
+                list_started.append((download_info.value, float_started))
+            list_entries = [self.download_manager.save(download, float_started, file_type) for download, float_started in list_started]
+            self.str_last_exported_file = list_entries[-1]["path"]
+            self.str_last_exported_hash = list_entries[-1]["sha256"]
             self.log.info(f"Exported file at: {self.str_last_exported_file}")
-            self.static_wait_with_polling()
-            return bool(download)
+            return [entry["path"] for entry in list_entries]
         except Exception as e:
             self.log.error(f"Error downloading file: {e}")
             raise Exception(f"Error downloading file: {e}") from e
 
-    def check_data_in_excel(self, expected_text: str):
+    def exported_content(self, lazy: bool = False) -> ContentIndex | None:
         try:
-            df = pd.read_excel(self.str_last_exported_file, header=None)
-            return df.astype(str).map(lambda x: expected_text in x).any().any()
+            if lazy:
+                return ContentIndexManager().lookup(self.str_last_exported_file, self.str_last_exported_hash)
+            return ContentIndexManager().get(self.str_last_exported_file, self.str_last_exported_hash)
+        except FileNotFoundError as e:
+            self.log.error(f"File not found: {self.str_last_exported_file}")
+            raise FileNotFoundError(f"File not found: {self.str_last_exported_file}") from e
+        except Exception as e:
+            self.log.error(f"Error indexing exported file: {e}")
+            raise Exception(f"Error indexing exported file: {e}") from e
+
+    def exported_spreadsheet(self) -> SpreadsheetManager:
+        return SpreadsheetManager(self.str_last_exported_file)
+
+    def find_data_in_excel(self, expected_text: str, first_only: bool = False) -> list[dict]:
+        from openpyxl.utils.exceptions import InvalidFileException
+        try:
+            return self.exported_spreadsheet().find(expected_text, first_only=first_only)
         except FileNotFoundError as e:
             self.log.error(f"File not found: {self.str_last_exported_file}")
             raise FileNotFoundError(f"File not found: {self.str_last_exported_file}") from e
@@ -390,15 +527,15 @@ class BasePage:
             self.log.error(f"Error checking data in Excel: {e}")
             raise Exception(f"Error checking data in Excel: {e}") from e
 
-    def check_data_in_pdf(self, expected_text: str):
+    def check_data_in_excel(self, expected_text: str):
+        content = self.exported_content(lazy=True)
+        if content is None:
+            return bool(self.find_data_in_excel(expected_text, first_only=True))
+        return bool(content.contains(expected_text, first_only=True))
+
+    def find_data_in_pdf(self, expected_texts: list[str], first_only: bool = True) -> dict[str, list[int]]:
         try:
-            with open(self.str_last_exported_file, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    text = page.extract_text()
-                    if text and expected_text in text:
-                        return True
-            return False
+            return PdfManager(self.str_last_exported_file).find(expected_texts, first_only=first_only)
         except FileNotFoundError as e:
             self.log.error(f"File not found: {self.str_last_exported_file}")
             raise FileNotFoundError(f"File not found: {self.str_last_exported_file}") from e
@@ -406,13 +543,15 @@ class BasePage:
             self.log.error(f"Error checking data in PDF: {e}")
             raise Exception(f"Error checking data in PDF: {e}") from e
 
-    def check_data_in_word(self, expected_text: str):
+    def check_data_in_pdf(self, expected_text: str):
+        content = self.exported_content(lazy=True)
+        if content is None:
+            return bool(self.find_data_in_pdf([expected_text])[expected_text])
+        return bool(content.contains(expected_text, first_only=True))
+
+    def find_data_in_word(self, expected_texts: list[str], first_only: bool = True) -> dict[str, list[dict]]:
         try:
-            doc = Document(self.str_last_exported_file)
-            for para in doc.paragraphs:
-                if expected_text in para.text:
-                    return True
-            return False
+            return DocxManager(self.str_last_exported_file).find(expected_texts, first_only=first_only)
         except FileNotFoundError as e:
             self.log.error(f"File not found: {self.str_last_exported_file}")
             raise FileNotFoundError(f"File not found: {self.str_last_exported_file}") from e
@@ -420,6 +559,12 @@ class BasePage:
             self.log.error(f"Error checking data in Word document: {e}")
             raise Exception(f"Error checking data in Word document: {e}") from e
 
+    def check_data_in_word(self, expected_text: str):
+        content = self.exported_content(lazy=True)
+        if content is None:
+            return bool(self.find_data_in_word([expected_text])[expected_text])
+        return bool(content.contains(expected_text, first_only=True))
+
     def click_and_capture_popup(self, pstr_selector: str):
         try:
             with self.page.expect_popup() as popup_info:
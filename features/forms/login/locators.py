@@ -1,4 +1,7 @@
+__non_selectors__ = ("ENDPOINT", "LOGGED_IN_ENDPOINT")
+
 ENDPOINT = "/practice-test-login/"
+LOGGED_IN_ENDPOINT = "/logged-in-successfully/"
 USERNAME = "input#username"
 PASSWORD = "input#password"
 LOGIN_BUTTON = "button#submit"
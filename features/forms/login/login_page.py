@@ -2,6 +2,7 @@ from playwright.sync_api import Page
 
 from features.forms.base_page import BasePage
 from features.forms.login import locators
+from features.utils.auth_manager import AuthManager
 
 
 class LoginPage(BasePage):
@@ -11,7 +12,8 @@ class LoginPage(BasePage):
 
     def navigate(self):
         url = self.config.get("BASE_URL") + locators.ENDPOINT
-        self.load_page_with_retry(url, locators.USERNAME)
+        if not self.load_page_with_retry(url, locators.USERNAME):
+            raise Exception(f"Login page {url} could not be loaded")
 
     def enter_username(self, username):
         self.type_text(locators.USERNAME, username)
@@ -22,6 +24,42 @@ class LoginPage(BasePage):
     def click_login(self):
         self.click(locators.LOGIN_BUTTON)
 
+    def login(self, username, password):
+        self.navigate()
+        self.enter_username(username)
+        self.enter_password(password)
+        self.click_login()
+        return self.validate_logout_button()
+
+    def open_logged_in(self, auth_manager: AuthManager, username, password):
+        url = self.config.get("BASE_URL") + locators.LOGGED_IN_ENDPOINT
+        if not self.load_page_with_retry(url, locators.LOGIN_TEXT):
+            raise Exception(f"Logged-in page {url} could not be loaded")
+        return self.ensure_logged_in(auth_manager, username, password)
+
+    def ensure_logged_in(self, auth_manager: AuthManager, username, password):
+        if self.validate_logout_button():
+            return True
+        self.log.warning(f"Session for {username} is no longer valid, logging in again")
+        auth_manager.invalidate(username, password)
+        if not self.login(username, password):
+            return False
+        auth_manager.save_storage_state(self.page.context, username, password)
+        return True
+
+    def validate_session_reused(self, auth_manager: AuthManager, username, password):
+        # the logged-in page renders without a session too, so check the context really carries the stored state
+        if auth_manager.stats["relogins"]:
+            self.log.error(f"Stored session for {username} was rejected and replaced by a fresh login")
+            return False
+        set_cookies = {(cookie["name"], cookie["domain"]) for cookie in self.page.context.cookies()}
+        list_missing = [cookie["name"] for cookie in auth_manager.state_cookies(username, password)
+                        if (cookie["name"], cookie["domain"]) not in set_cookies]
+        if list_missing:
+            self.log.error(f"Cookies from the stored session of {username} are missing from the context: {list_missing}")
+            return False
+        return True
+
     def validate_welcome_message(self):
         return self.wait_for_element(locators.LOGIN_TEXT)
 
@@ -30,3 +68,7 @@ class LoginPage(BasePage):
 
     def validate_error_message(self):
         return self.wait_for_element(locators.ERROR)
+
+    def validate_logged_in(self):
+        dict_results = self.wait_for_elements({locators.LOGIN_TEXT: "visible", locators.LOGOUT_BUTTON: "visible"})
+        return all(result["ok"] for result in dict_results.values())
@@ -8,8 +8,7 @@ Feature: Login Functionality
     When user enters valid username
     And user enters valid password
     And user clicks on submit button
-    Then user should see the welcome message
-    And user should see the logout button
+    Then user should see the welcome message and the logout button
 
   Scenario: validate login with invalid credentials
     When user enters invalid username
@@ -0,0 +1,7 @@
+@ui @regression @authenticated
+Feature: Authenticated Session
+
+  Scenario: validate authenticated session is reused
+    Given user is logged in
+    Then user should see the welcome message and the logout button
+    And the stored session should be reused
@@ -4,13 +4,9 @@ from pytest_bdd import scenario, given, when, then
 
 from conftest import allure_labels
 from features.forms.login.login_page import LoginPage
-from features.utils.excel_manager import ExcelManager
-from features.utils.secrets_manager import SecretsManager
 
 feature_path = "../feature_files/login.feature"
-secrets = SecretsManager()
-excel = ExcelManager("creds.xlsx")
-test_data = excel.read("Sheet1")
+session_feature_path = "../feature_files/session.feature"
 
 
 @pytest.fixture
@@ -25,7 +21,7 @@ def user_on_login_page(login_page: LoginPage):
 
 
 @allure_labels("Login", "Validate Login with Valid Credentials", "Regression", "UI")
-@pytest.mark.parametrize("username, password", [(data["VALID_USERNAME"], data["VALID_PASSWORD"]) for data in test_data])
+@pytest.mark.test_data("creds.xlsx", "Sheet1", username="VALID_USERNAME", password="VALID_PASSWORD")
 @scenario(feature_path, "validate login with valid credentials")
 def test_login_valid_credentials(username, password):
     allure.dynamic.title("validate login with valid credentials")
@@ -49,25 +45,40 @@ def click_submit(login_page: LoginPage):
     login_page.click_login()
 
 
-@then("user should see the welcome message")
-@allure.step("user should see the welcome message")
-def validate_welcome_message(login_page: LoginPage):
-    login_page.validate_welcome_message()
-
-
-@then("user should see the logout button")
-@allure.step("user should see the logout button")
-def validate_logout_button(login_page: LoginPage):
-    login_page.validate_logout_button()
+@then("user should see the welcome message and the logout button")
+@allure.step("user should see the welcome message and the logout button")
+def validate_logged_in(login_page: LoginPage):
+    assert login_page.validate_logged_in(), "Welcome message and logout button are not both visible"
 
 
 @allure_labels("Login", "Validate Login with Invalid Credentials", "Regression", "UI")
-@pytest.mark.parametrize("username, password", [(data["INVALID_USERNAME"], data["INVALID_PASSWORD"]) for data in test_data])
+@pytest.mark.test_data("creds.xlsx", "Sheet1", username="INVALID_USERNAME", password="INVALID_PASSWORD")
 @scenario(feature_path, "validate login with invalid credentials")
 def test_login_invalid_credentials(username, password):
     allure.dynamic.title("validate login with invalid credentials")
 
 
+@allure_labels("Login", "Validate Authenticated Session", "Regression", "UI")
+@scenario(session_feature_path, "validate authenticated session is reused")
+def test_authenticated_session():
+    allure.dynamic.title("validate authenticated session is reused")
+
+
+@given("user is logged in")
+@allure.step("user is logged in")
+def user_logged_in(login_page: LoginPage, auth_manager, credentials):
+    username, password = credentials
+    assert login_page.open_logged_in(auth_manager, username, password), f"Could not log in as {username}"
+
+
+@then("the stored session should be reused")
+@allure.step("the stored session should be reused")
+def validate_session_reused(login_page: LoginPage, auth_manager, credentials):
+    username, password = credentials
+    assert auth_manager.stats["hits"] + auth_manager.stats["misses"], "The page was not created from a stored session"
+    assert login_page.validate_session_reused(auth_manager, username, password), f"Stored session for {username} was not reused"
+
+
 @when("user enters invalid username")
 @allure.step("user enters invalid username")
 def enter_invalid_username(login_page: LoginPage, username):
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+from features.utils.config_manager import ConfigManager
+from features.utils.log_manager import LogManager
+
+
+class AllureManager:
+    RESULT_SUFFIXES = ("-result.json", "-container.json")
+
+    def __init__(self):
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.allure_cmd = "allure.bat" if platform.system() == "Windows" else "allure"
+        self.fingerprint_file = os.path.join(self.config.allure_history_path, "fingerprint")
+
+    def result_dirs(self, roots: list[str] | None = None) -> list[str]:
+        list_dirs = []
+        for str_root in roots or [self.config.allure_results_path]:
+            for str_current, list_subdirs, list_files in os.walk(str_root):
+                if "history" in list_subdirs:
+                    list_subdirs.remove("history")
+                if any(name.endswith(self.RESULT_SUFFIXES) for name in list_files):
+                    list_dirs.append(os.path.abspath(str_current))
+        return sorted(set(list_dirs))
+
+    @staticmethod
+    def fingerprint(dirs: list[str]) -> str:
+        digest = hashlib.sha256()
+        for str_dir in dirs:
+            for str_name in sorted(os.listdir(str_dir)):
+                str_path = os.path.join(str_dir, str_name)
+                if os.path.isfile(str_path):
+                    stat = os.stat(str_path)
+                    digest.update(f"{str_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def build(self, roots: list[str] | None = None) -> bool:
+        dict_timings = {}
+        float_start = time.perf_counter()
+        list_dirs = self.result_dirs(roots)
+        dict_timings["discover"] = time.perf_counter() - float_start
+        if not list_dirs:
+            self.log.warning("No allure results found, skipping report generation.")
+            return False
+
+        float_start = time.perf_counter()
+        str_fingerprint = self.fingerprint(list_dirs)
+        dict_timings["fingerprint"] = time.perf_counter() - float_start
+        str_index = os.path.join(self.config.allure_report_path, "index.html")
+        if os.path.exists(self.fingerprint_file) and os.path.exists(str_index):
+            with open(self.fingerprint_file, encoding="utf-8") as f:
+                if f.read() == str_fingerprint:
+                    self.log.info("Allure results unchanged since the last build, skipping report generation.")
+                    return False
+
+        float_start = time.perf_counter()
+        str_history = os.path.join(self.config.allure_history_path, "history")
+        if os.path.isdir(str_history):
+            for str_dir in list_dirs:
+                shutil.copytree(str_history, os.path.join(str_dir, "history"), dirs_exist_ok=True)
+        dict_timings["restore_history"] = time.perf_counter() - float_start
+
+        float_start = time.perf_counter()
+        try:
+            subprocess.run([self.allure_cmd, "generate", *list_dirs, "-o", self.config.allure_report_path, "--clean"], check=True)
+        except FileNotFoundError:
+            self.log.error(f"Allure command '{self.allure_cmd}' not found. Skipping report generation.")
+            return False
+        except subprocess.CalledProcessError as e:
+            self.log.error(f"Allure report generation failed for dirs: {list_dirs} with error: {e}")
+            return False
+        dict_timings["generate"] = time.perf_counter() - float_start
+
+        float_start = time.perf_counter()
+        str_report_history = os.path.join(self.config.allure_report_path, "history")
+        if os.path.isdir(str_report_history):
+            shutil.copytree(str_report_history, str_history, dirs_exist_ok=True)
+        os.makedirs(self.config.allure_history_path, exist_ok=True)
+        with open(self.fingerprint_file, "w", encoding="utf-8") as f:
+            f.write(str_fingerprint)
+        dict_timings["save_history"] = time.perf_counter() - float_start
+
+        str_timings = ", ".join(f"{phase}={seconds * 1000:.0f} ms" for phase, seconds in dict_timings.items())
+        self.log.info(f"Allure report generated from {len(list_dirs)} result dirs ({str_timings})")
+        return True
+
+    def build_in_background(self, roots: list[str] | None = None) -> subprocess.Popen:
+        if platform.system() == "Windows":
+            options = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            options = {"start_new_session": True}
+        process = subprocess.Popen([sys.executable, "-m", "features.utils.allure_manager", *(roots or [])], cwd=self.config.root_dir,
+                                   stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **options)
+        self.log.info(f"Allure report build started in the background (pid {process.pid})")
+        return process
+
+
+if __name__ == "__main__":
+    AllureManager().build(sys.argv[1:] or None)
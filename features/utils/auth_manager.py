@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import time
+from typing import Callable
+
+from playwright.sync_api import BrowserContext
+
+from features.utils.config_manager import ConfigManager, get_worker_id
+from features.utils.log_manager import LogManager
+
+
+class AuthManager:
+    def __init__(self):
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.ttl = self.config.get("AUTH_STATE_TTL")  # in seconds
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "relogins": 0}
+
+    def state_path(self, username: str, password: str) -> str:
+        str_key = hashlib.sha256(f"{username}:{password}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.config.auth_state_path, f"{get_worker_id()}-{str_key}.json")
+
+    def is_expired(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return True
+        if time.time() - os.path.getmtime(path) > self.ttl:
+            return True
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            self.log.error(f"Unreadable storage state {path}: {e}")
+            return True
+        float_now = time.time()
+        return any(0 < cookie.get("expires", -1) < float_now for cookie in state.get("cookies", []))
+
+    def get_storage_state(self, username: str, password: str, login: Callable[[str, str, str], None]) -> str:
+        str_path = self.state_path(username, password)
+        if not self.is_expired(str_path):
+            self.stats["hits"] += 1
+            self.log.info(f"Using cached storage state for {username}")
+            return str_path
+        if os.path.exists(str_path):
+            self.stats["expired"] += 1
+            self.log.info(f"Cached storage state for {username} has expired")
+        self.stats["misses"] += 1
+        os.makedirs(os.path.dirname(str_path), exist_ok=True)
+        login(username, password, str_path)
+        self.log.info(f"Saved storage state for {username}")
+        return str_path
+
+    def save_storage_state(self, context: BrowserContext, username: str, password: str) -> str:
+        str_path = self.state_path(username, password)
+        os.makedirs(os.path.dirname(str_path), exist_ok=True)
+        context.storage_state(path=str_path)
+        return str_path
+
+    def state_cookies(self, username: str, password: str) -> list[dict]:
+        with open(self.state_path(username, password), encoding="utf-8") as f:
+            return json.load(f).get("cookies", [])
+
+    def invalidate(self, username: str, password: str) -> None:
+        str_path = self.state_path(username, password)
+        if os.path.exists(str_path):
+            os.remove(str_path)
+        self.stats["relogins"] += 1
+        self.log.info(f"Invalidated storage state for {username}")
+
+    def log_stats(self) -> None:
+        self.log.info(f"Auth state cache stats: hits={self.stats['hits']}, misses={self.stats['misses']}, "
+                      f"expired={self.stats['expired']}, relogins={self.stats['relogins']}")
@@ -1,85 +1,238 @@
+import glob
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 import yaml
 
+SCHEMA = {
+    "HEADLESS": bool,
+    "STATIC_WAIT": int,
+    "RETRY_ATTEMPTS": int,
+    "NAV_BACKOFF_BASE_MS": int,
+    "NAV_BACKOFF_MAX_MS": int,
+    "NAV_RETRY_BUDGET": int,
+    "NAV_BREAKER_THRESHOLD": int,
+    "CONTEXT_POOL": bool,
+    "CONTEXT_POOL_SIZE": int,
+    "AUTH_STATE_TTL": int,
+    "NETWORK_BUFFER_SIZE": int,
+    "RESOURCE_BLOCKING": bool,
+    "BLOCK_MEASURE_BYTES": bool,
+    "BLOCK_RULES": list,
+    "BROWSER": str,
+    "DYNAMIC_WAIT": int,
+    "VIEWPORT_WIDTH": int,
+    "VIEWPORT_HEIGHT": int,
+    "SCREENSHOT_FORMAT": str,
+    "SCREENSHOT_QUALITY": int,
+    "SCREENSHOT_SCALE": str,
+    "ARTIFACT_ATTACHMENT": str,
+    "TRACING": str,
+    "PDF_WORKERS": int,
+    "PDF_PARALLEL_MIN_PAGES": int,
+    "CONTENT_INDEX_MAX_BYTES": int,
+    "REPORT_PATH": str,
+    "EXPORTS_PATH": str,
+    "DOWNLOAD_MANIFEST_PATH": str,
+    "LOG_PATH": str,
+    "LOG_LEVEL": str,
+    "LOG_ASYNC": bool,
+    "LOG_FORMAT": str,
+    "LOG_MAX_BYTES": int,
+    "LOG_BACKUP_COUNT": int,
+    "LOG_LEVELS": dict,
+    "PROJECT": str,
+    "VIDEO_PATH": str,
+    "TEST_DATA_PATH": str,
+    "TEST_DATA_CACHE_PATH": str,
+    "AUTH_STATE_PATH": str,
+    "TRACE_PATH": str,
+    "BASE_URL": str,
+    "SCREENSHOT_PATH": str,
+    "ALLURE_REPORT_PATH": str,
+    "ALLURE_REPORT_MODE": str,
+    "ALLURE_HISTORY_PATH": str,
+    "HTML_REPORT_PATH": str,
+    "HTML_REPORT_MODE": str,
+    "HTML_ASSETS_PATH": str,
+    "ALLURE_RESULTS_PATH": str,
+    "NETWORK_CALLS_PATH": str,
+    "NETWORK_SUMMARY_PATH": str,
+}
+
 
 def is_ci():
     return os.getenv("GITHUB_ACTIONS", "false").lower() == "true"
 
 
+def get_worker_id():
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def is_controller(config):
+    return not hasattr(config, "workerinput")
+
+
+def _coerce(key, value, expected_type):
+    if isinstance(value, str) and expected_type is not str:
+        if expected_type is bool and value.lower() in ("true", "false"):
+            return value.lower() == "true"
+        if expected_type is int and value.lstrip("-").isdigit():
+            return int(value)
+        if expected_type in (list, dict):
+            value = yaml.safe_load(value)
+    if isinstance(value, expected_type) and not (expected_type is int and isinstance(value, bool)):
+        return value
+    raise ValueError(f"Invalid value for {key}: expected {expected_type.__name__}, got {value!r}")
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def load_config():
+    root_dir = os.getenv("GITHUB_WORKSPACE") or str(Path(__file__).resolve().parents[2])
+    config_file = os.path.join(root_dir, "config.yml")
+    with open(config_file, encoding="utf-8") as file:
+        data = yaml.safe_load(file) or {}
+    unknown_keys = sorted(set(data) - set(SCHEMA))
+    missing_keys = sorted(set(SCHEMA) - set(data))
+    if unknown_keys or missing_keys:
+        raise KeyError(f"Invalid configuration in {config_file}: unknown keys {unknown_keys}, missing keys {missing_keys}")
+    values = {}
+    for key, expected_type in SCHEMA.items():
+        env_value = os.getenv(key)
+        values[key] = _freeze(_coerce(key, env_value if env_value is not None else data[key], expected_type))
+    paths = {key: os.path.join(root_dir, value) for key, value in values.items() if key.endswith("_PATH")}
+    return root_dir, MappingProxyType(values), MappingProxyType(paths)
+
+
 class ConfigManager:
     def __init__(self):
-        self.root_dir = os.getenv("GITHUB_WORKSPACE") or str(Path(__file__).resolve().parents[2])
-        config_file = os.path.join(self.root_dir, "config.yml")
-        with open(config_file, encoding="utf-8") as file:
-            self.data = yaml.safe_load(file)
+        self.root_dir, self.data, self.paths = load_config()
 
     def get(self, key):
         try:
-            env_value = os.getenv(key)
-            if env_value is not None:
-                return env_value
-            return self.data.get(key)
+            return self.data[key]
         except KeyError as e:
             raise KeyError(f"Key {key} not found in configuration.") from e
 
+    @staticmethod
+    def worker_path(path, extension=None):
+        worker_id = get_worker_id()
+        root, ext = os.path.splitext(path)
+        if worker_id == "master" and extension is None:
+            return path
+        return f"{root}.{worker_id}{extension if extension is not None else ext}"
+
+    @staticmethod
+    def worker_parts(path, extension=None):
+        root, ext = os.path.splitext(path)
+        list_parts = glob.glob(f"{glob.escape(root)}.*{extension if extension is not None else ext}")
+        return sorted(list_parts, key=lambda part: [int(t) if t.isdigit() else t for t in re.split(r"(\d+)", part)])
+
     @property
     def test_data_path(self):
-        return os.path.join(self.root_dir, self.get("TEST_DATA_PATH"))
+        return self.paths["TEST_DATA_PATH"]
+
+    @property
+    def test_data_cache_path(self):
+        return self.paths["TEST_DATA_CACHE_PATH"]
 
     @property
     def report_path(self):
-        return os.path.join(self.root_dir, self.get("REPORT_PATH"))
+        return self.paths["REPORT_PATH"]
 
     @property
     def exports_path(self):
-        return os.path.join(self.root_dir, self.get("EXPORTS_PATH"))
+        return self.paths["EXPORTS_PATH"]
+
+    @property
+    def download_manifest_path(self):
+        return self.paths["DOWNLOAD_MANIFEST_PATH"]
 
     @property
     def log_path(self):
-        return os.path.join(self.root_dir, self.get("LOG_PATH"))
+        return self.paths["LOG_PATH"]
 
     @property
     def screenshot_path(self):
-        return os.path.join(self.root_dir, self.get("SCREENSHOT_PATH"))
+        return self.paths["SCREENSHOT_PATH"]
 
     @property
     def video_path(self):
-        return os.path.join(self.root_dir, self.get("VIDEO_PATH"))
+        return self.paths["VIDEO_PATH"]
 
     @property
     def allure_results_path(self):
-        return os.path.join(self.root_dir, self.get("ALLURE_RESULTS_PATH"))
+        return self.paths["ALLURE_RESULTS_PATH"]
 
     @property
     def allure_report_path(self):
-        return os.path.join(self.root_dir, self.get("ALLURE_REPORT_PATH"))
+        return self.paths["ALLURE_REPORT_PATH"]
+
+    @property
+    def allure_history_path(self):
+        return self.paths["ALLURE_HISTORY_PATH"]
 
     @property
     def html_report_path(self):
-        return os.path.join(self.root_dir, self.get("HTML_REPORT_PATH"))
+        return self.paths["HTML_REPORT_PATH"]
+
+    @property
+    def html_assets_path(self):
+        return self.paths["HTML_ASSETS_PATH"]
 
     @property
     def trace_path(self):
-        return os.path.join(self.root_dir, self.get("TRACE_PATH"))
+        return self.paths["TRACE_PATH"]
 
     @property
     def network_calls_path(self):
-        return os.path.join(self.root_dir, self.get("NETWORK_CALLS_PATH"))
+        return self.paths["NETWORK_CALLS_PATH"]
+
+    @property
+    def network_summary_path(self):
+        return self.paths["NETWORK_SUMMARY_PATH"]
+
+    @property
+    def auth_state_path(self):
+        return self.paths["AUTH_STATE_PATH"]
 
 
 if __name__ == "__main__":
+    from timeit import timeit
+
+    int_runs = 10000
+    load_config.cache_clear()
+    print(f"Cold load: {timeit(load_config, number=1) * 1e6:.1f} us")
+    print(f"Construction: {timeit(ConfigManager, number=int_runs) / int_runs * 1e6:.2f} us")
     config = ConfigManager()
+    print(f"Lookup: {timeit(lambda: config.get('DYNAMIC_WAIT'), number=int_runs) / int_runs * 1e6:.2f} us")
+    print(f"Path property: {timeit(lambda: config.log_path, number=int_runs) / int_runs * 1e6:.2f} us")
     print("Browser:", config.get("BROWSER"))
     print("Height:", config.get("VIEWPORT_HEIGHT"))
     print("Test Data Path:", config.test_data_path)
+    print("Test Data Cache Path:", config.test_data_cache_path)
     print("Report Path:", config.report_path)
     print("Log Path:", config.log_path)
+    print("Download Manifest Path:", config.download_manifest_path)
     print("Screenshot Path:", config.screenshot_path)
     print("Video Path:", config.video_path)
     print("Allure Results Path:", config.allure_results_path)
     print("Allure Report Path:", config.allure_report_path)
+    print("Allure History Path:", config.allure_history_path)
     print("HTML Report Path:", config.html_report_path)
+    print("HTML Assets Path:", config.html_assets_path)
     print("Trace Path:", config.trace_path)
     print("Network Calls Path:", config.network_calls_path)
+    print("Network Summary Path:", config.network_summary_path)
+    print("Auth State Path:", config.auth_state_path)
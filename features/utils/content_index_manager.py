@@ -0,0 +1,128 @@
+import hashlib
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+
+from features.utils.config_manager import ConfigManager
+from features.utils.docx_manager import DocxManager
+from features.utils.log_manager import LogManager
+from features.utils.pdf_manager import PdfManager
+from features.utils.spreadsheet_manager import SpreadsheetManager
+
+
+class ContentIndex:
+    def __init__(self, file_path: str, entries: list[tuple[dict, str]]):
+        self.file = file_path
+        # (scope, text) per cell / page / paragraph, plus the joined text for a single fast negative check
+        self.entries = entries
+        self.full_text = "\n".join(str_text for _, str_text in entries)
+        self.size = sys.getsizeof(self.full_text) * 2 + sum(sys.getsizeof(scope) for scope, _ in entries)
+        self.log = LogManager(__name__).get_logger()
+
+    @staticmethod
+    def _in_scope(dict_scope: dict, scope: dict | None) -> bool:
+        return not scope or all(dict_scope.get(key) == value for key, value in scope.items())
+
+    def contains(self, expected_text: str, scope: dict | None = None, first_only: bool = False) -> list[dict]:
+        float_start = time.perf_counter()
+        list_matches = []
+        if expected_text in self.full_text:
+            for dict_scope, str_text in self.entries:
+                if expected_text in str_text and self._in_scope(dict_scope, scope):
+                    list_matches.append(dict_scope)
+                    if first_only:
+                        break
+        self.log.info(f"Index query '{expected_text}' on {os.path.basename(self.file)}: {len(list_matches)} matches "
+                      f"({(time.perf_counter() - float_start) * 1000:.2f} ms)")
+        return list_matches
+
+    def search(self, pattern: str | re.Pattern, scope: dict | None = None) -> list[dict]:
+        float_start = time.perf_counter()
+        regex = re.compile(pattern) if isinstance(pattern, str) else pattern
+        list_matches = []
+        for dict_scope, str_text in self.entries:
+            if self._in_scope(dict_scope, scope):
+                list_matches.extend({**dict_scope, "match": match.group(0)} for match in regex.finditer(str_text))
+        self.log.info(f"Index regex '{regex.pattern}' on {os.path.basename(self.file)}: {len(list_matches)} matches "
+                      f"({(time.perf_counter() - float_start) * 1000:.2f} ms)")
+        return list_matches
+
+    def text(self, scope: dict) -> str:
+        return "\n".join(str_text for dict_scope, str_text in self.entries if self._in_scope(dict_scope, scope))
+
+
+class ContentIndexManager:
+    cache = OrderedDict()
+    scanned = set()
+    stats = {"hits": 0, "misses": 0, "evictions": 0, "scans": 0}
+
+    def __init__(self):
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.max_bytes = self.config.get("CONTENT_INDEX_MAX_BYTES")
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    @staticmethod
+    def extract(file_path: str) -> list[tuple[dict, str]]:
+        str_extension = os.path.splitext(file_path)[1].lower()
+        if str_extension in (".xlsx", ".xlsm"):
+            return [({"sheet": cell["sheet"], "cell": cell["cell"], "row": cell["row"], "column": cell["column"]}, str(cell["value"]))
+                    for cell in SpreadsheetManager(file_path).cells()]
+        if str_extension == ".pdf":
+            return [({"page": int_page}, str_text) for int_page, str_text in PdfManager(file_path).page_texts().items()]
+        if str_extension == ".docx":
+            return list(DocxManager(file_path).iter_paragraphs())
+        raise ValueError(f"Unsupported export type for content index: {file_path}")
+
+    def get(self, file_path: str, digest: str | None = None) -> ContentIndex:
+        str_digest = digest or self.file_hash(file_path)
+        index = ContentIndexManager.cache.get(str_digest)
+        if index is not None:
+            ContentIndexManager.cache.move_to_end(str_digest)
+            ContentIndexManager.stats["hits"] += 1
+            return index
+        ContentIndexManager.stats["misses"] += 1
+        float_start = time.perf_counter()
+        index = ContentIndex(file_path, self.extract(file_path))
+        self.log.info(f"Built content index for {os.path.basename(file_path)}: {len(index.entries)} entries, "
+                      f"{index.size // 1024} KiB in {(time.perf_counter() - float_start) * 1000:.0f} ms")
+        ContentIndexManager.cache[str_digest] = index
+        self._evict()
+        return index
+
+    def lookup(self, file_path: str, digest: str | None = None) -> ContentIndex | None:
+        # the first check of a file scans it with an early exit; the index is only built once the same content is checked again
+        str_digest = digest or self.file_hash(file_path)
+        if str_digest in ContentIndexManager.cache or str_digest in ContentIndexManager.scanned:
+            return self.get(file_path, str_digest)
+        ContentIndexManager.scanned.add(str_digest)
+        ContentIndexManager.stats["scans"] += 1
+        return None
+
+    def _evict(self) -> None:
+        # least recently used first; the newest index is kept even when it alone exceeds the cap
+        while len(ContentIndexManager.cache) > 1 and sum(index.size for index in ContentIndexManager.cache.values()) > self.max_bytes:
+            _, index = ContentIndexManager.cache.popitem(last=False)
+            ContentIndexManager.stats["evictions"] += 1
+            self.log.info(f"Evicted content index for {os.path.basename(index.file)}")
+
+    def log_stats(self) -> None:
+        stats = ContentIndexManager.stats
+        self.log.info(f"Content index stats: hits={stats['hits']}, misses={stats['misses']}, evictions={stats['evictions']}, "
+                      f"scans={stats['scans']}, "
+                      f"cached={len(ContentIndexManager.cache)}")
+
+
+if __name__ == "__main__":
+    index_manager = ContentIndexManager()
+    content = index_manager.get(sys.argv[1])
+    for str_query in sys.argv[2:]:
+        print(str_query, content.contains(str_query))
+    index_manager.get(sys.argv[1])
+    index_manager.log_stats()
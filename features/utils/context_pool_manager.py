@@ -0,0 +1,81 @@
+from playwright.sync_api import Browser, BrowserContext
+
+from features.utils.log_manager import LogManager
+
+CLEAR_STORAGE_SCRIPT = """async () => {
+    try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}
+    try {
+        if (indexedDB.databases) {
+            for (const db of await indexedDB.databases()) { indexedDB.deleteDatabase(db.name); }
+        }
+    } catch (e) {}
+}"""
+
+
+class ContextPoolManager:
+    def __init__(self, browser: Browser, context_options: dict, size: int):
+        self.browser = browser
+        self.context_options = context_options
+        self.size = size
+        self.log = LogManager(__name__).get_logger()
+        self.idle_contexts = []
+        # the contexts themselves, not their ids: an id can be reused once a discarded context is garbage-collected
+        self.used_contexts = set()
+        self.stats = {"created": 0, "reused": 0, "recreated": 0}
+
+    def _new_context(self) -> BrowserContext:
+        context = self.browser.new_context(**self.context_options)
+        self.stats["created"] += 1
+        return context
+
+    def warm_up(self) -> None:
+        while len(self.idle_contexts) < self.size:
+            self.idle_contexts.append(self._new_context())
+        self.log.info(f"Context pool warmed up with {self.size} contexts")
+
+    def acquire(self) -> BrowserContext:
+        context = self.idle_contexts.pop() if self.idle_contexts else self._new_context()
+        if context in self.used_contexts:
+            self.stats["reused"] += 1
+        else:
+            self.used_contexts.add(context)
+        return context
+
+    def release(self, context: BrowserContext, dirty: bool = False) -> None:
+        if not dirty:
+            try:
+                dirty = not self._reset(context)
+            except Exception as e:
+                self.log.error(f"Failed to reset pooled context: {e}")
+                dirty = True
+        if dirty:
+            self.used_contexts.discard(context)
+            try:
+                context.close()
+            except Exception as e:
+                self.log.error(f"Failed to close dirty pooled context: {e}")
+            context = self._new_context()
+            self.stats["recreated"] += 1
+        self.idle_contexts.append(context)
+
+    @staticmethod
+    def _reset(context: BrowserContext) -> bool:
+        for page in context.pages:
+            if not page.is_closed():
+                page.evaluate(CLEAR_STORAGE_SCRIPT)
+                page.close()
+        context.clear_cookies()
+        context.clear_permissions()
+        context.unroute_all(behavior="ignoreErrors")
+        state = context.storage_state()
+        return not state["cookies"] and not any(origin.get("localStorage") for origin in state["origins"])
+
+    def close(self) -> None:
+        for context in self.idle_contexts:
+            try:
+                context.close()
+            except Exception as e:
+                self.log.error(f"Failed to close pooled context: {e}")
+        self.idle_contexts = []
+        self.log.info(f"Context pool stats: created={self.stats['created']}, reused={self.stats['reused']}, "
+                      f"recreated={self.stats['recreated']}")
@@ -0,0 +1,67 @@
+import fnmatch
+import os
+import sys
+import time
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+from features.utils.log_manager import LogManager
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class DocxManager:
+    # body first, then the parts python-docx never exposes through doc.paragraphs
+    PARTS = ("word/document.xml", "word/header*.xml", "word/footer*.xml", "word/footnotes.xml", "word/endnotes.xml")
+
+    def __init__(self, file_path: str):
+        self.file = file_path
+        self.log = LogManager(__name__).get_logger()
+
+    def parts(self, archive: zipfile.ZipFile) -> list[str]:
+        list_names = archive.namelist()
+        return [name for pattern in self.PARTS for name in sorted(fnmatch.filter(list_names, pattern))]
+
+    @staticmethod
+    def paragraphs(stream):
+        # yields the text of every w:p as it closes; text boxes (w:txbxContent) and table cells are nested paragraphs
+        list_stack = []
+        for event, element in iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if element.tag == f"{W_NS}p":
+                    list_stack.append([])
+                continue
+            if element.tag == f"{W_NS}t" and list_stack:
+                list_stack[-1].append(element.text or "")
+            elif element.tag in (f"{W_NS}tab", f"{W_NS}br") and list_stack:
+                list_stack[-1].append("\t" if element.tag == f"{W_NS}tab" else "\n")
+            elif element.tag == f"{W_NS}p":
+                yield "".join(list_stack.pop())
+                element.clear()
+
+    def iter_paragraphs(self):
+        with zipfile.ZipFile(self.file) as archive:
+            for str_part in self.parts(archive):
+                with archive.open(str_part) as stream:
+                    for int_index, str_text in enumerate(self.paragraphs(stream)):
+                        yield {"part": str_part, "paragraph": int_index}, str_text
+
+    def find(self, expected_texts: list[str] | tuple[str, ...], first_only: bool = True) -> dict[str, list[dict]]:
+        dict_matches = {text: [] for text in expected_texts}
+        float_start = time.perf_counter()
+        int_paragraphs = 0
+        for dict_location, str_text in self.iter_paragraphs():
+            int_paragraphs += 1
+            for text in expected_texts:
+                if text in str_text:
+                    dict_matches[text].append(dict_location)
+            if first_only and all(dict_matches.values()):
+                break
+        self.log.info(f"Scanned {int_paragraphs} paragraphs of {os.path.basename(self.file)} in "
+                      f"{(time.perf_counter() - float_start) * 1000:.0f} ms")
+        return dict_matches
+
+
+if __name__ == "__main__":
+    docx = DocxManager(sys.argv[1])
+    print(docx.find(sys.argv[2:] or ["the"]))
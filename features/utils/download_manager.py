@@ -0,0 +1,85 @@
+import hashlib
+import itertools
+import json
+import os
+import re
+import time
+
+from playwright.sync_api import Download
+
+from features.utils.config_manager import ConfigManager, get_worker_id
+from features.utils.log_manager import ContextFilter, LogManager
+
+
+class DownloadManager:
+    sequence = itertools.count(1)
+
+    def __init__(self):
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.manifest_part = self.config.worker_path(self.config.download_manifest_path, ".jsonl")
+
+    @staticmethod
+    def current_test() -> str:
+        return ContextFilter.context["test_id"] or "session"
+
+    def unique_path(self, suggested_filename: str, file_type: str | None = None) -> str:
+        # <worker>-<test>-<sequence>-<suggested name>: unique across xdist workers, tests and back-to-back downloads
+        str_stem, str_extension = os.path.splitext(suggested_filename)
+        str_extension = f".{file_type}" if file_type else str_extension
+        str_test = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.current_test().split("::")[-1])[:80]
+        str_stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", str_stem)[:60] or "download"
+        return os.path.join(self.config.exports_path, f"{get_worker_id()}-{str_test}-{next(DownloadManager.sequence):03d}-{str_stem}{str_extension}")
+
+    def save(self, download: Download, float_started: float, file_type: str | None = None) -> dict:
+        str_path = self.unique_path(download.suggested_filename, file_type)
+        os.makedirs(os.path.dirname(str_path), exist_ok=True)
+        digest = hashlib.sha256()
+        int_bytes = 0
+        # path() returns once the download event has completed; copying from it hashes the content in the same pass
+        str_failure = download.failure()
+        if str_failure is None:
+            try:
+                str_source = download.path()
+            except Exception:
+                str_source = None
+            if str_source is None:
+                download.save_as(str_path)
+                str_source = str_path
+            with open(str_source, "rb") as source:
+                target = open(str_path, "wb") if str_source != str_path else None
+                try:
+                    while chunk := source.read(1024 * 1024):
+                        digest.update(chunk)
+                        int_bytes += len(chunk)
+                        if target is not None:
+                            target.write(chunk)
+                finally:
+                    if target is not None:
+                        target.close()
+        entry = {"test": self.current_test(), "worker": get_worker_id(), "url": download.url, "suggested_filename": download.suggested_filename,
+                 "path": str_path, "bytes": int_bytes, "sha256": digest.hexdigest() if str_failure is None else None,
+                 "duration_ms": round((time.perf_counter() - float_started) * 1000), "failure": str_failure}
+        with open(self.manifest_part, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        if str_failure is not None:
+            raise Exception(f"Download of {download.url} failed: {str_failure}")
+        self.log.info(f"Downloaded {download.suggested_filename} to {str_path} ({int_bytes} bytes, {entry['duration_ms']} ms)")
+        return entry
+
+    def manifest_parts(self) -> list[str]:
+        return self.config.worker_parts(self.config.download_manifest_path, ".jsonl")
+
+    def merge_manifest(self) -> int:
+        list_parts = self.manifest_parts()
+        int_entries = 0
+        os.makedirs(os.path.dirname(self.config.download_manifest_path), exist_ok=True)
+        with open(self.config.download_manifest_path, "w", encoding="utf-8") as manifest:
+            for str_part in list_parts:
+                with open(str_part, encoding="utf-8") as part:
+                    for line in part:
+                        manifest.write(line)
+                        int_entries += 1
+                os.remove(str_part)
+        self.log.info(f"Download manifest written to {self.config.download_manifest_path} ({int_entries} downloads)")
+        return int_entries
@@ -1,38 +1,209 @@
+import glob
+import hashlib
 import os
+import pickle
+import tempfile
+import time
+from contextlib import contextmanager, suppress
+from functools import lru_cache
 
-import pandas as pd
-
-from features.utils.config_manager import ConfigManager
+from features.utils.config_manager import ConfigManager, get_worker_id
+from features.utils.log_manager import LogManager
 
 
 class ExcelManager:
+    pending = {}
+    sheets = {}
+
     def __init__(self, file_name: str):
-        config = ConfigManager()
-        self.file = os.path.join(config.test_data_path, file_name)
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.file = os.path.join(self.config.test_data_path, file_name)
+
+    def cache_path(self, sheet_name, columns=None):
+        # <file>-<sheet/columns key>-<size/mtime key>.pickle: a changed workbook misses the cache and replaces the stale entry
+        stat = os.stat(self.file)
+        str_sheet_key = hashlib.sha256(f"{os.path.abspath(self.file)}:{sheet_name}:{columns}".encode("utf-8")).hexdigest()[:16]
+        str_stat_key = hashlib.sha256(f"{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8")).hexdigest()[:16]
+        str_stem = os.path.splitext(os.path.basename(self.file))[0]
+        return os.path.join(self.config.test_data_cache_path, f"{str_stem}-{str_sheet_key}-{str_stat_key}.pickle")
+
+    def _load_cache(self, path):
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            self.log.error(f"Unreadable test data cache {path}: {e}")
+            return None
 
-    def read(self, sheet_name):
+    def _store_cache(self, path, records):
+        # write to a temp file and rename so parallel workers never see a partial entry
+        str_dir = os.path.dirname(path)
+        os.makedirs(str_dir, exist_ok=True)
+        int_fd, str_temp = tempfile.mkstemp(dir=str_dir, suffix=".tmp")
+        try:
+            with os.fdopen(int_fd, "wb") as f:
+                pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(str_temp, path)
+        except OSError as e:
+            self.log.error(f"Failed to write test data cache {path}: {e}")
+            if os.path.exists(str_temp):
+                os.remove(str_temp)
+            return
+        str_prefix = path.rsplit("-", 1)[0]
+        for str_stale in glob.glob(f"{glob.escape(str_prefix)}-*.pickle"):
+            if str_stale != path:
+                try:
+                    os.remove(str_stale)
+                except OSError:
+                    pass
+
+    def read(self, sheet_name, columns=None):
+        float_start = time.perf_counter()
+        str_cache = self.cache_path(sheet_name, tuple(columns) if columns else None)
+        records = self._load_cache(str_cache)
+        if records is not None:
+            self.log.info(f"Test data cache hit for {os.path.basename(self.file)}[{sheet_name}] "
+                          f"({(time.perf_counter() - float_start) * 1000:.1f} ms)")
+            return records
+        records = self.read_rows(sheet_name, columns) if columns else self._read_frame(sheet_name)
+        self._store_cache(str_cache, records)
+        self.log.info(f"Test data cache miss for {os.path.basename(self.file)}[{sheet_name}], parsed in "
+                      f"{(time.perf_counter() - float_start) * 1000:.1f} ms")
+        return records
+
+    def _read_frame(self, sheet_name):
+        import pandas as pd
         try:
             data_frame = pd.read_excel(self.file, sheet_name=sheet_name)
             return data_frame.to_dict(orient="records")
         except Exception as e:
             raise Exception(f"Error reading Excel file: {e}") from e
 
+    def read_rows(self, sheet_name, columns=None):
+        from openpyxl import load_workbook
+        try:
+            workbook = load_workbook(self.file, read_only=True, data_only=True)
+            try:
+                worksheet = workbook[sheet_name]
+                # read-only mode trusts the sheet's <dimension>, which can understate the data; rescan the real extent
+                worksheet.reset_dimensions()
+                rows = worksheet.iter_rows(values_only=True)
+                header = next(rows, ())
+                list_columns = list(columns) if columns else [column for column in header if column is not None]
+                missing = [column for column in list_columns if column not in header]
+                if missing:
+                    raise KeyError(f"Columns {missing} not found in sheet {sheet_name}")
+                list_indexes = [header.index(column) for column in list_columns]
+                return [{column: row[index] if index < len(row) else None for column, index in zip(list_columns, list_indexes)}
+                        for row in rows if any(value is not None for value in row)]
+            finally:
+                workbook.close()
+        except Exception as e:
+            raise Exception(f"Error reading Excel file: {e}") from e
+
+    def sheet_names(self):
+        if self.file not in ExcelManager.sheets:
+            from openpyxl import load_workbook
+            workbook = load_workbook(self.file, read_only=True)
+            try:
+                ExcelManager.sheets[self.file] = tuple(workbook.sheetnames)
+            finally:
+                workbook.close()
+        return ExcelManager.sheets[self.file]
+
     def write(self, sheet, column, row, value):
+        # buffered: cells are written by flush(), usually once at session end, so the sheet is checked here at the call site
+        if sheet not in self.sheet_names():
+            raise Exception(f"Error writing to Excel file: sheet {sheet} not found in {os.path.basename(self.file)}")
+        ExcelManager.pending.setdefault(self.file, {})[(sheet, column, row)] = value
+        return True
+
+    @contextmanager
+    def _locked(self, timeout: float = 60.0):
+        str_lock = f"{self.file}.lock"
+        float_deadline = time.monotonic() + timeout
+        while True:
+            try:
+                int_fd = os.open(str_lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(str_lock) > timeout:
+                        self.log.error(f"Removing stale lock {str_lock}")
+                        os.remove(str_lock)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > float_deadline:
+                    raise TimeoutError(f"Timed out waiting for lock {str_lock}")
+                time.sleep(0.05)
         try:
-            with pd.ExcelFile(self.file) as excel_file:
-                sheets = {s: excel_file.parse(s) for s in excel_file.sheet_names}
-            sheets[sheet][column] = sheets[sheet][column].astype(object)
-            sheets[sheet].at[row, column] = value
-            with pd.ExcelWriter(self.file, engine='openpyxl') as writer:
-                for s, df in sheets.items():
-                    df.to_excel(writer, sheet_name=s, float_format="%2f", index=False)
-            return True
+            os.write(int_fd, str(os.getpid()).encode("utf-8"))
+            os.close(int_fd)
+            yield
+        finally:
+            # another process may already have removed the lock as stale
+            with suppress(FileNotFoundError):
+                os.remove(str_lock)
+
+    def flush(self):
+        from openpyxl import load_workbook
+        dict_updates = ExcelManager.pending.pop(self.file, {})
+        if not dict_updates:
+            return 0
+        float_start = time.perf_counter()
+        try:
+            with self._locked():
+                workbook = load_workbook(self.file)
+                for (sheet, column, row), value in dict_updates.items():
+                    worksheet = workbook[sheet]
+                    header = [cell.value for cell in worksheet[1]]
+                    if column not in header:
+                        worksheet.cell(row=1, column=len(header) + 1, value=column)
+                        header.append(column)
+                    # row is the zero-based data row, as in the records returned by read()
+                    worksheet.cell(row=row + 2, column=header.index(column) + 1, value=value)
+                str_temp = f"{self.file}.{get_worker_id()}.tmp"
+                workbook.save(str_temp)
+                os.replace(str_temp, self.file)
         except Exception as e:
+            ExcelManager.pending[self.file] = {**dict_updates, **ExcelManager.pending.get(self.file, {})}
             raise Exception(f"Error writing to Excel file: {e}") from e
+        self.log.info(f"Flushed {len(dict_updates)} cell updates to {os.path.basename(self.file)} in "
+                      f"{(time.perf_counter() - float_start) * 1000:.0f} ms")
+        return len(dict_updates)
+
+    @staticmethod
+    def flush_all():
+        # runs in session teardown: one failing workbook must not stop the remaining files or the rest of the teardown
+        int_flushed = 0
+        for str_file in list(ExcelManager.pending):
+            excel_manager = ExcelManager(str_file)
+            try:
+                int_flushed += excel_manager.flush()
+            except Exception as e:
+                excel_manager.log.error(f"Failed to flush {os.path.basename(str_file)}: {e}")
+        return int_flushed
+
+
+@lru_cache(maxsize=None)
+def load_test_data(file_name: str, sheet_name: str, columns: tuple[str, ...] | None = None) -> tuple[dict, ...]:
+    return tuple(ExcelManager(file_name).read(sheet_name, columns))
 
 
 if __name__ == "__main__":
     excel_manager = ExcelManager("creds.xlsx")
-    data = excel_manager.read("Sheet1")
+    for str_label in ("cold", "warm"):
+        if str_label == "cold":
+            for str_entry in glob.glob(os.path.join(excel_manager.config.test_data_cache_path, "creds-*.pickle")):
+                os.remove(str_entry)
+        float_start = time.perf_counter()
+        data = excel_manager.read("Sheet1")
+        print(f"{str_label} read: {(time.perf_counter() - float_start) * 1000:.2f} ms")
     print(data)
+    print(load_test_data("creds.xlsx", "Sheet1", ("VALID_USERNAME", "VALID_PASSWORD")))
     excel_manager.write("Sheet1", "STATUS", 1, "Passed")
+    excel_manager.flush()
@@ -1,32 +1,133 @@
+import atexit
+import json
 import logging
 import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-from features.utils.config_manager import ConfigManager
+from features.utils.config_manager import ConfigManager, get_worker_id
+
+ROOT_LOGGER = "features"
+
+
+class ContextFilter(logging.Filter):
+    context = {"test_id": None, "step": None}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.worker = get_worker_id()
+        record.test_id = self.context["test_id"]
+        record.step = self.context["step"]
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "worker": getattr(record, "worker", None),
+            "test_id": getattr(record, "test_id", None),
+            "step": getattr(record, "step", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
 
 
 class LogManager:
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
+    configured = False
+    listener = None
+
+    def __init__(self, name: str = ROOT_LOGGER):
+        self.config = ConfigManager()
+        if not LogManager.configured:
+            self._configure()
+        self.logger = logging.getLogger(self.logger_name(name))
+
+    @staticmethod
+    def logger_name(name: str) -> str:
+        # a module run with python -m is named __main__, outside the features hierarchy the handlers hang off
+        if name != "__main__":
+            return name
+        spec = getattr(sys.modules["__main__"], "__spec__", None)
+        if spec is not None and spec.name.startswith(f"{ROOT_LOGGER}."):
+            return spec.name
+        return f"{ROOT_LOGGER}.__main__"
 
-        config = ConfigManager()
-        log_file = config.log_path
+    def _configure(self) -> None:
+        root_logger = logging.getLogger(ROOT_LOGGER)
+        root_logger.setLevel(self.config.get("LOG_LEVEL"))
+
+        log_file = self.config.worker_path(self.config.log_path)
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
         console_handler = logging.StreamHandler()
-        file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+        file_handler = RotatingFileHandler(log_file, mode='a', maxBytes=self.config.get("LOG_MAX_BYTES"),
+                                           backupCount=self.config.get("LOG_BACKUP_COUNT"), encoding='utf-8')
 
         log_format = logging.Formatter("%(asctime)s - %(message)s")
         console_handler.setFormatter(log_format)
-        file_handler.setFormatter(log_format)
+        file_handler.setFormatter(JsonFormatter() if self.config.get("LOG_FORMAT") == "json" else log_format)
+
+        context_filter = ContextFilter()
+        if self.config.get("LOG_ASYNC"):
+            log_queue = queue.SimpleQueue()
+            queue_handler = QueueHandler(log_queue)
+            queue_handler.addFilter(context_filter)
+            root_logger.addHandler(queue_handler)
+            LogManager.listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+            LogManager.listener.start()
+            atexit.register(LogManager.stop)
+        else:
+            for handler in (console_handler, file_handler):
+                handler.addFilter(context_filter)
+                root_logger.addHandler(handler)
 
-        if not self.logger.hasHandlers():
-            self.logger.addHandler(console_handler)
-            self.logger.addHandler(file_handler)
+        for str_logger, str_level in (self.config.get("LOG_LEVELS") or {}).items():
+            logging.getLogger(str_logger).setLevel(str_level)
+        LogManager.configured = True
 
     def get_logger(self) -> logging.Logger:
         return self.logger
 
+    @staticmethod
+    def set_context(**kwargs) -> None:
+        ContextFilter.context.update(kwargs)
+
+    @staticmethod
+    def flush() -> None:
+        if LogManager.listener is not None:
+            LogManager.listener.stop()
+            LogManager.listener.start()
+
+    @staticmethod
+    def stop() -> None:
+        if LogManager.listener is not None:
+            LogManager.listener.stop()
+            LogManager.listener = None
+
+    def worker_log_files(self) -> list[str]:
+        return self.config.worker_parts(self.config.log_path)
+
+    def merge_worker_logs(self) -> None:
+        list_files = self.worker_log_files()
+        if not list_files:
+            return
+        self.flush()
+        bool_json = self.config.get("LOG_FORMAT") == "json"
+        with open(self.config.log_path, mode="a", encoding="utf-8") as merged:
+            for str_file in list_files:
+                if not bool_json:
+                    str_worker_id = str_file.rsplit(".", 2)[-2]
+                    merged.write(f"===== {str_worker_id} =====\n")
+                with open(str_file, encoding="utf-8") as f:
+                    for line in f:
+                        merged.write(line)
+                os.remove(str_file)
+
 
 if __name__ == "__main__":
     log_manager = LogManager()
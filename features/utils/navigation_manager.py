@@ -0,0 +1,63 @@
+import random
+from urllib.parse import urlparse
+
+from features.utils.config_manager import ConfigManager
+from features.utils.log_manager import LogManager
+
+
+class NavigationManager:
+    # process-wide: the budget and the breakers span every page object in the session
+    retries_used = 0
+    breakers = {}
+    attempts = []
+
+    def __init__(self):
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.backoff_base = self.config.get("NAV_BACKOFF_BASE_MS") / 1000
+        self.backoff_max = self.config.get("NAV_BACKOFF_MAX_MS") / 1000
+        self.retry_budget = self.config.get("NAV_RETRY_BUDGET")
+        self.breaker_threshold = self.config.get("NAV_BREAKER_THRESHOLD")
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlparse(url).netloc or url
+
+    def is_open(self, url: str) -> bool:
+        return NavigationManager.breakers.get(self.host(url), {}).get("open", False)
+
+    def backoff(self, int_attempt: int) -> float:
+        # full jitter: spreads retries from parallel workers instead of synchronising them
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** int_attempt))
+
+    def take_retry(self) -> bool:
+        if NavigationManager.retries_used >= self.retry_budget:
+            return False
+        NavigationManager.retries_used += 1
+        return True
+
+    def record(self, url: str, int_attempt: int, outcome: str, float_goto: float, float_wait: float, float_backoff: float = 0.0) -> None:
+        entry = {"host": self.host(url), "url": url, "attempt": int_attempt, "outcome": outcome, "goto_ms": round(float_goto * 1000),
+                 "wait_ms": round(float_wait * 1000), "backoff_ms": round(float_backoff * 1000)}
+        NavigationManager.attempts.append(entry)
+        self.log.info(f"Navigation attempt {int_attempt} to {url}: {outcome} (goto {entry['goto_ms']} ms, wait {entry['wait_ms']} ms)")
+
+    def host_failed(self, url: str) -> None:
+        # only failures to reach the host count; a page that loads without the expected element proves the host is up
+        breaker = NavigationManager.breakers.setdefault(self.host(url), {"failures": 0, "open": False})
+        breaker["failures"] += 1
+        if not breaker["open"] and breaker["failures"] >= self.breaker_threshold:
+            breaker["open"] = True
+            self.log.error(f"Circuit breaker opened for {self.host(url)} after {breaker['failures']} consecutive failures")
+
+    def host_reached(self, url: str) -> None:
+        NavigationManager.breakers[self.host(url)] = {"failures": 0, "open": False}
+
+    def log_stats(self) -> None:
+        if not NavigationManager.attempts:
+            return
+        list_failed = [attempt for attempt in NavigationManager.attempts if attempt["outcome"] != "ok"]
+        list_open = [str_host for str_host, breaker in NavigationManager.breakers.items() if breaker["open"]]
+        self.log.info(f"Navigation stats: attempts={len(NavigationManager.attempts)}, failed={len(list_failed)}, "
+                      f"retries={NavigationManager.retries_used}/{self.retry_budget}, "
+                      f"backoff={sum(attempt['backoff_ms'] for attempt in NavigationManager.attempts)} ms, open breakers={list_open}")
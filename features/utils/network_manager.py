@@ -0,0 +1,122 @@
+import json
+import math
+import os
+import queue
+import threading
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Request, Response
+
+from features.utils.config_manager import ConfigManager
+from features.utils.log_manager import LogManager
+
+
+class NetworkManager:
+    def __init__(self):
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.capture_path = self.config.worker_path(self.config.network_calls_path, ".jsonl")
+        self.queue = queue.Queue(maxsize=self.config.get("NETWORK_BUFFER_SIZE"))
+        self.writer = None
+        self.dropped = 0
+        self.test_stats = {}
+
+    def start(self) -> None:
+        if self.writer is not None:
+            return
+        os.makedirs(os.path.dirname(self.capture_path), exist_ok=True)
+        self.writer = threading.Thread(target=self._write, name="network-writer", daemon=True)
+        self.writer.start()
+
+    @staticmethod
+    def endpoint_key(method: str, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{method} {parts.scheme}://{parts.netloc}{parts.path}"
+
+    @staticmethod
+    def call_record(request: Request, response: Response | None = None) -> dict:
+        timing = request.timing
+
+        def phase(start, end):
+            if timing.get(start, -1) < 0 or timing.get(end, -1) < 0:
+                return -1
+            return round(timing[end] - timing[start], 1)
+
+        int_bytes = -1
+        if response is not None:
+            try:
+                int_bytes = request.sizes()["responseBodySize"]
+            except Exception:
+                pass
+        return {
+            "method": request.method,
+            "url": request.url,
+            "status": response.status if response is not None else "",
+            "failure": request.failure or "",
+            "dns": phase("domainLookupStart", "domainLookupEnd"),
+            "connect": phase("connectStart", "connectEnd"),
+            "ttfb": phase("requestStart", "responseStart"),
+            "download": phase("responseStart", "responseEnd"),
+            "duration": round(timing["responseEnd"], 1) if timing.get("responseEnd", -1) >= 0 else -1,
+            "bytes": int_bytes,
+        }
+
+    @staticmethod
+    def add_to_stats(stats: dict, call: dict) -> None:
+        endpoint = stats.setdefault(NetworkManager.endpoint_key(call["method"], call["url"]), {"count": 0, "bytes": 0, "durations": []})
+        endpoint["count"] += 1
+        endpoint["bytes"] += max(call["bytes"], 0)
+        if call["duration"] >= 0:
+            endpoint["durations"].append(call["duration"])
+
+    @staticmethod
+    def percentile(values: list[float], pct: float) -> float:
+        if not values:
+            return -1
+        ordered = sorted(values)
+        return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+    @staticmethod
+    def summarize(stats: dict) -> list[dict]:
+        summary = []
+        for str_endpoint, endpoint in sorted(stats.items()):
+            durations = endpoint["durations"]
+            summary.append({
+                "endpoint": str_endpoint,
+                "count": endpoint["count"],
+                "p50_ms": NetworkManager.percentile(durations, 50),
+                "p95_ms": NetworkManager.percentile(durations, 95),
+                "p99_ms": NetworkManager.percentile(durations, 99),
+                "bytes": endpoint["bytes"],
+            })
+        return summary
+
+    def pop_test_summary(self, test_id: str) -> list[dict]:
+        return self.summarize(self.test_stats.pop(test_id, {}))
+
+    def record(self, test_id: str, call: dict) -> None:
+        self.start()
+        self.add_to_stats(self.test_stats.setdefault(test_id, {}), call)
+        try:
+            self.queue.put({"test": test_id, **call}, timeout=1)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write(self) -> None:
+        with open(self.capture_path, "a", encoding="utf-8") as f:
+            while True:
+                call = self.queue.get()
+                if call is None:
+                    break
+                f.write(json.dumps(call, separators=(",", ":")) + "\n")
+                if self.queue.empty():
+                    f.flush()
+
+    def stop(self) -> None:
+        if self.writer is None:
+            return
+        self.queue.put(None)
+        self.writer.join()
+        self.writer = None
+        if self.dropped:
+            self.log.warning(f"Dropped {self.dropped} network calls because the capture buffer was full")
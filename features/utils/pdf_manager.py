@@ -0,0 +1,118 @@
+import atexit
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from features.utils.config_manager import ConfigManager
+from features.utils.log_manager import LogManager
+
+
+def extract_pages(file_path: str, list_pages: list[int], expected_texts: tuple[str, ...], first_only: bool,
+                  keep_text: bool = False) -> list[tuple[int, float, list[str], str | None]]:
+    # runs in the pool: each chunk opens its own reader and returns (page number, seconds, matched texts, text) per page
+    import PyPDF2
+    list_results = []
+    set_remaining = set(expected_texts)
+    with open(file_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for int_page in list_pages:
+            float_start = time.perf_counter()
+            str_text = reader.pages[int_page].extract_text() or ""
+            list_found = [text for text in expected_texts if text in str_text]
+            list_results.append((int_page + 1, time.perf_counter() - float_start, list_found, str_text if keep_text else None))
+            set_remaining.difference_update(list_found)
+            if first_only and expected_texts and not set_remaining:
+                break
+    return list_results
+
+
+class PdfManager:
+    executor = None
+
+    def __init__(self, file_path: str):
+        self.file = file_path
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.page_timings = {}
+
+    @staticmethod
+    def pool(int_workers: int) -> ProcessPoolExecutor:
+        # spawned once per process and reused; spawn avoids forking the logging and screenshot threads
+        if PdfManager.executor is None:
+            PdfManager.executor = ProcessPoolExecutor(max_workers=int_workers, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(PdfManager.close)
+        return PdfManager.executor
+
+    @staticmethod
+    def close() -> None:
+        if PdfManager.executor is not None:
+            PdfManager.executor.shutdown(wait=False, cancel_futures=True)
+            PdfManager.executor = None
+
+    @staticmethod
+    def default_workers() -> int:
+        # every xdist worker owns a pool, so split the cores between them instead of spawning cpu_count each
+        int_cpus = os.cpu_count() or 1
+        int_xdist_workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1") or 1)
+        return max(1, int_cpus // max(1, int_xdist_workers))
+
+    def page_count(self) -> int:
+        import PyPDF2
+        with open(self.file, "rb") as f:
+            return len(PyPDF2.PdfReader(f).pages)
+
+    def _scan(self, tuple_texts: tuple[str, ...], first_only: bool, keep_text: bool) -> tuple[dict[str, list[int]], dict[int, str]]:
+        dict_matches = {text: [] for text in tuple_texts}
+        dict_texts = {}
+        self.page_timings = {}
+        float_start = time.perf_counter()
+        int_pages = self.page_count()
+        int_workers = self.config.get("PDF_WORKERS") or self.default_workers()
+
+        def collect(list_results) -> bool:
+            for int_page, float_seconds, list_found, str_text in list_results:
+                self.page_timings[int_page] = float_seconds
+                if keep_text:
+                    dict_texts[int_page] = str_text
+                for text in list_found:
+                    dict_matches[text].append(int_page)
+            return first_only and bool(dict_matches) and all(dict_matches.values())
+
+        if int_pages < self.config.get("PDF_PARALLEL_MIN_PAGES") or int_workers == 1:
+            collect(extract_pages(self.file, list(range(int_pages)), tuple_texts, first_only, keep_text))
+        else:
+            # small chunks keep the early exit responsive: once every text is found the queued chunks are cancelled
+            int_chunk = max(1, min(16, int_pages // (int_workers * 4)))
+            executor = self.pool(int_workers)
+            pending = {executor.submit(extract_pages, self.file, list(range(start, min(start + int_chunk, int_pages))), tuple_texts, first_only,
+                                       keep_text)
+                       for start in range(0, int_pages, int_chunk)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                if any([collect(future.result()) for future in done]):
+                    for future in pending:
+                        future.cancel()
+                    break
+        for list_pages in dict_matches.values():
+            list_pages.sort()
+
+        float_extraction = sum(self.page_timings.values())
+        int_slowest = max(self.page_timings, key=self.page_timings.get, default=None)
+        str_slowest = f", slowest page {int_slowest} ({self.page_timings[int_slowest] * 1000:.0f} ms)" if int_slowest else ""
+        self.log.info(f"Scanned {len(self.page_timings)}/{int_pages} pages of {os.path.basename(self.file)} in "
+                      f"{(time.perf_counter() - float_start) * 1000:.0f} ms (extraction {float_extraction * 1000:.0f} ms{str_slowest})")
+        return dict_matches, dict(sorted(dict_texts.items()))
+
+    def find(self, expected_texts: list[str] | tuple[str, ...], first_only: bool = True) -> dict[str, list[int]]:
+        return self._scan(tuple(expected_texts), first_only, keep_text=False)[0]
+
+    def page_texts(self) -> dict[int, str]:
+        return self._scan((), first_only=False, keep_text=True)[1]
+
+
+if __name__ == "__main__":
+    pdf = PdfManager(sys.argv[1])
+    print(pdf.find(sys.argv[2:] or ["the"]))
+    print(pdf.page_timings)
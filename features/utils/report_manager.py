@@ -1,45 +1,72 @@
 import base64
+import hashlib
+import html
+import json
 import os
 import platform
-import subprocess
-import time
+import re
+import shutil
 from functools import wraps
-from pathlib import Path
 from typing import Any
 
 import allure
 import pytest
 from pytest_html import extras
 
+from features.utils.allure_manager import AllureManager
 from features.utils.config_manager import ConfigManager, is_ci
 from features.utils.log_manager import LogManager
+from features.utils.network_manager import NetworkManager
+from features.utils.screenshot_manager import ScreenshotManager
 
 
 class ReportManager:
+    # the page fixture stores its page on the item: pytest-bdd scenarios request it from steps, so it is not in item.funcargs
+    PAGE_KEY = pytest.StashKey()
+    ARTIFACT_POLICIES = ("always", "on-failure", "never")
+
     def __init__(self):
         self.config = ConfigManager()
-        self.log = LogManager().get_logger()
-        self.network_calls = []
+        self.log = LogManager(__name__).get_logger()
+        self.network_manager = NetworkManager()
+        self.screenshot_manager = ScreenshotManager()
         self.EXTENSIONS = ('.js', '.css', '.woff', '.woff2', '.ttf', '.otf', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.map')
         self.KEYWORDS = ('google-analytics', 'sentry', 'hotjar', 'intercom', 'segment', 'datadog')
-
-    def attach_video_to_report(self) -> None:
-        if not is_ci():
-            video_files = list(Path(self.config.video_path).glob("*.webm"))
-            if video_files:
-                video_file = video_files[0]
-                with open(video_file, "rb") as f:
-                    allure.attach(f.read(), name="playwright-video", attachment_type=allure.attachment_type.WEBM)
-            else:
-                self.log.warning("No video files found in the video directory.")
-            if os.path.exists(self.config.trace_path):
-                with open(self.config.trace_path, "rb") as f:
-                    allure.attach(f.read(), name="playwright-trace")
-        else:
+        self.artifact_policy = self.config.get("ARTIFACT_ATTACHMENT")
+        if self.artifact_policy not in self.ARTIFACT_POLICIES:
+            raise ValueError(f"Invalid ARTIFACT_ATTACHMENT policy: {self.artifact_policy}. Expected one of {self.ARTIFACT_POLICIES}")
+        self.html_assets_mode = self.config.get("HTML_REPORT_MODE") == "assets"
+        self.network_filter = re.compile("|".join([f"(?:{'|'.join(map(re.escape, self.EXTENSIONS))})$", *map(re.escape, self.KEYWORDS)]))
+
+    def attach_video_to_report(self, video_path: str | None, trace_path: str | None, failed: bool) -> None:
+        if is_ci():
             self.log.info("Skipping video & trace file attachment in CI environment.")
+            return
+        if self.artifact_policy == "never" or (self.artifact_policy == "on-failure" and not failed):
+            for str_path in (video_path, trace_path):
+                if str_path and os.path.exists(str_path):
+                    os.remove(str_path)
+            self.log.info(f"Skipping video & trace file attachment (policy: {self.artifact_policy})")
+            return
+        if video_path and os.path.exists(video_path):
+            self.link_file_to_report(video_path, "playwright-video", allure.attachment_type.WEBM.mime_type, "webm")
+        else:
+            self.log.warning("No video file was recorded for this test.")
+        if trace_path and os.path.exists(trace_path):
+            self.link_file_to_report(trace_path, "playwright-trace", "application/zip", "zip")
+
+    def link_file_to_report(self, source: str, name: str, mime_type: str, extension: str) -> None:
+        str_file_name = ScreenshotManager.register_attachment(name, mime_type, extension)
+        if str_file_name is None:
+            return
+        str_destination = os.path.join(self.config.allure_results_path, str_file_name)
+        try:
+            os.link(source, str_destination)
+        except OSError:
+            shutil.copyfile(source, str_destination)
 
     def add_environment_info_to_report(self, session: pytest.Session) -> None:
-        dynamic_wait_time = int(self.config.get('DYNAMIC_WAIT')) // 1000
+        dynamic_wait_time = self.config.get('DYNAMIC_WAIT') // 1000
         env_info = {
             'Browser': self.config.get('BROWSER'),
             'Static_Wait_Time': f"{self.config.get('STATIC_WAIT')} seconds",
@@ -90,8 +117,7 @@ class ReportManager:
                 return
             try:
                 if not page.is_closed():
-                    screenshot = page.screenshot()
-                    allure.attach(screenshot, name=f"Step: {step.name}", attachment_type=allure.attachment_type.PNG)
+                    self.screenshot_manager.capture(page, request.node.nodeid, f"Step: {step.name}")
                 else:
                     self.log.error("Skipping screenshot: Page is already closed")
             except Exception as e:
@@ -105,79 +131,117 @@ class ReportManager:
             try:
                 if not page.is_closed():
                     if not hasattr(page, "_network_listeners_attached"):
-                        def log_request(requester):
-                            if not requester.url.endswith(self.EXTENSIONS) and not (any(key in requester.url for key in self.KEYWORDS)):
-                                self.network_calls.append({
-                                    "type": "Request",
-                                    "method": requester.method,
-                                    "url": requester.url,
-                                    "status": ""
-                                })
-
-                        def log_response(response):
-                            if not response.url.endswith(self.EXTENSIONS) and not (any(key in response.url for key in self.KEYWORDS)):
-                                self.network_calls.append({
-                                    "type": "Response",
-                                    "method": "",
-                                    "url": response.url,
-                                    "status": response.status
-                                })
-
-                        page.on("request", log_request)
-                        page.on("response", log_response)
+                        str_test_id = request.node.nodeid
+
+                        def log_request_finished(requester):
+                            if not self.network_filter.search(requester.url):
+                                self.network_manager.record(str_test_id, self.network_manager.call_record(requester, requester.response()))
+
+                        def log_request_failed(requester):
+                            if not self.network_filter.search(requester.url):
+                                self.network_manager.record(str_test_id, self.network_manager.call_record(requester))
+
+                        page.on("requestfinished", log_request_finished)
+                        page.on("requestfailed", log_request_failed)
                         page._network_listeners_attached = True
                 else:
                     self.log.error("[intercept_network_calls] Skipping network interception: Page is already closed")
             except Exception as e:
                 self.log.error(f"[intercept_network_calls] Network interception failed: {e}")
 
+    def network_call_parts(self) -> list[str]:
+        return self.config.worker_parts(self.config.network_calls_path, ".jsonl")
+
+    def dump_network_calls(self) -> None:
+        self.network_manager.stop()
+
+    def attach_network_summary(self, test_id: str) -> None:
+        summary = self.network_manager.pop_test_summary(test_id)
+        if summary:
+            allure.attach(json.dumps(summary, indent=2), name="network-summary", attachment_type=allure.attachment_type.JSON)
+
     def write_network_calls_to_html(self) -> None:
-        html_header = '<html><head><title>Network Calls</title></head><body><table border="1"><tr><th>Type</th><th>Method</th><th>URL</th><th>Status</th></tr>'
-        html_footer = "</table></body></html>"
-        rows = []
-        for call in self.network_calls:
-            row = f"<tr><td>{call['type']}</td><td>{call['method']}</td><td>{call['url']}</td><td>{call['status']}</td></tr>"
-            rows.append(row)
+        list_columns = ["Worker", "Test", "Method", "URL", "Status", "DNS (ms)", "Connect (ms)", "TTFB (ms)", "Download (ms)", "Duration (ms)",
+                        "Bytes"]
+        html_header = ('<html><head><title>Network Calls</title></head><body><table border="1">'
+                       "<tr>" + "".join(f"<th>{column}</th>" for column in list_columns) + "</tr>")
+        html_footer = "</body></html>"
+        session_stats = {}
         with open(self.config.network_calls_path, "w", encoding="utf-8") as f:
-            f.write(html_header + "".join(rows) + html_footer)
+            f.write(html_header)
+            for str_part in self.network_call_parts():
+                str_worker_id = str_part.rsplit(".", 2)[-2]
+                with open(str_part, encoding="utf-8") as part:
+                    for line in part:
+                        call = json.loads(line)
+                        self.network_manager.add_to_stats(session_stats, call)
+                        cells = [str_worker_id, call["test"], call["method"], call["url"], call["status"] or call["failure"], call["dns"],
+                                 call["connect"], call["ttfb"], call["download"], call["duration"], call["bytes"]]
+                        f.write("<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in cells) + "</tr>")
+                os.remove(str_part)
+            f.write("</table>")
+            summary = self.network_manager.summarize(session_stats)
+            if summary:
+                f.write('<h2>Endpoints</h2><table border="1"><tr>' + "".join(f"<th>{key}</th>" for key in summary[0]) + "</tr>")
+                for endpoint in summary:
+                    f.write("<tr>" + "".join(f"<td>{html.escape(str(value))}</td>" for value in endpoint.values()) + "</tr>")
+                f.write("</table>")
+            f.write(html_footer)
+        with open(self.config.network_summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
 
     def attach_screenshot_on_failure(self, request, step) -> None:
         if is_ci() and 'ui' in request.node.keywords:
             try:
                 page = request.getfixturevalue("page")
                 if page and not page.is_closed():
-                    screenshot = page.screenshot()
-                    allure.attach(screenshot, name=f"Step failed: {step.name}", attachment_type=allure.attachment_type.PNG)
+                    self.screenshot_manager.capture(page, request.node.nodeid, f"Step failed: {step.name}", dedupe=False)
             except Exception as e:
                 self.log.error(f"Screenshot failed: {e}")
 
-    def attach_screenshot_to_report(self, outcome, call: pytest.CallInfo) -> None:
+    def report_screenshot(self, item: pytest.Item, failed: bool) -> bytes | None:
+        page = item.stash.get(self.PAGE_KEY, None) if 'ui' in item.keywords else None
+        if failed and page and not page.is_closed():
+            # the last step screenshot predates the failure, so show the page as it is now
+            return self.screenshot_manager.take(page)
+        return self.screenshot_manager.last_screenshots.get(item.nodeid)
+
+    def attach_screenshot_to_report(self, item: pytest.Item, outcome, call: pytest.CallInfo) -> None:
         try:
             report = outcome.get_result()
             if call.when == "call":
-                screenshot = getattr(pytest, "extra_screenshot", None)
-                if screenshot and os.path.exists(screenshot):
-                    if not hasattr(report, "extra"):
-                        report.extra = []
-                    with open(screenshot, "rb") as f:
-                        encoded = base64.b64encode(f.read()).decode("utf-8")
-                        html_img = f'<img src="data:image/png;base64,{encoded}" />'
-                        report.extra.append(extras.html(html_img))
-                pytest.extra_screenshot = None
+                screenshot = self.report_screenshot(item, report.failed)
+                if screenshot:
+                    attachment_type = self.screenshot_manager.attachment_type
+                    if self.html_assets_mode:
+                        str_url = self.html_asset_url(screenshot, attachment_type.extension)
+                        html_img = f'<a href="{str_url}" target="_blank"><img src="{str_url}" loading="lazy" width="320" /></a>'
+                    else:
+                        encoded = base64.b64encode(screenshot).decode("utf-8")
+                        html_img = f'<img src="data:{attachment_type.mime_type};base64,{encoded}" />'
+                    # pytest-html reads report.extras when the report is logged, after every makereport wrapper has run
+                    report.extras = [*getattr(report, "extras", []), extras.html(html_img)]
         except Exception as e:
             self.log.error(f"Error attaching screenshot: {e}")
 
-    def run_report(self) -> None:
-        int_wait_time = int(self.config.get("STATIC_WAIT"))
-        time.sleep(int_wait_time)
-        os.chdir(self.config.root_dir)
-        allure_cmd = "allure.bat" if platform.system() == "Windows" else "allure"
-        try:
-            if not is_ci():
-                subprocess.run([allure_cmd, "generate", self.config.allure_results_path, "-o", self.config.allure_report_path, "--clean"],
-                               check=True)
-        except FileNotFoundError:
-            self.log.error(f"Allure command '{allure_cmd}' not found. Skipping report generation.")
-        except subprocess.CalledProcessError as e:
-            self.log.error(f"Allure report generation failed for dir: {self.config.allure_results_path} with error: {e}")
+    def html_asset_url(self, content: bytes, extension: str) -> str:
+        str_digest = hashlib.sha256(content).hexdigest()
+        str_asset_path = os.path.join(self.config.html_assets_path, f"{str_digest}.{extension}")
+        if not os.path.exists(str_asset_path):
+            os.makedirs(self.config.html_assets_path, exist_ok=True)
+            try:
+                with open(str_asset_path, "xb") as f:
+                    f.write(content)
+            except FileExistsError:
+                pass  # another worker stored the same content first
+        str_relative_path = os.path.relpath(str_asset_path, os.path.dirname(self.config.html_report_path))
+        return str_relative_path.replace(os.sep, "/")
 
+    def run_report(self) -> None:
+        if is_ci():
+            return
+        allure_manager = AllureManager()
+        if self.config.get("ALLURE_REPORT_MODE") == "background":
+            allure_manager.build_in_background()
+        else:
+            allure_manager.build()
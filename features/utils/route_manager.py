@@ -0,0 +1,77 @@
+import re
+from urllib.parse import urlsplit
+
+from playwright.sync_api import BrowserContext, Route
+
+from features.utils.config_manager import ConfigManager
+from features.utils.log_manager import LogManager
+
+
+class RouteManager:
+    RULE_KEYS = ("name", "action", "hosts", "resource_types")
+
+    def __init__(self):
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.enabled = self.config.get("RESOURCE_BLOCKING")
+        self.measure_bytes = self.config.get("BLOCK_MEASURE_BYTES")
+        self.rules = [self._compile_rule(rule) for rule in self.config.get("BLOCK_RULES") or []]
+        self.stats = {rule["name"]: {"requests": 0, "bytes": 0} for rule in self.rules}
+
+    @staticmethod
+    def _compile_rule(rule: dict) -> dict:
+        unknown_keys = sorted(set(rule) - set(RouteManager.RULE_KEYS))
+        if unknown_keys:
+            raise ValueError(f"Invalid block rule {rule.get('name')}: unknown keys {unknown_keys}, expected {RouteManager.RULE_KEYS}")
+        if not rule.get("name"):
+            raise ValueError(f"Invalid block rule {dict(rule)}: name is required")
+        # a rule without criteria would match, and block, every request
+        if not rule.get("hosts") and not rule.get("resource_types"):
+            raise ValueError(f"Invalid block rule {rule['name']}: at least one of hosts or resource_types is required")
+        if rule.get("action", "abort") not in ("abort", "stub"):
+            raise ValueError(f"Invalid action for block rule {rule.get('name')}: {rule.get('action')}")
+        hosts = rule.get("hosts") or []
+        return {
+            "name": rule["name"],
+            "action": rule.get("action", "abort"),
+            "hosts": re.compile("|".join(map(re.escape, hosts))) if hosts else None,
+            "resource_types": set(rule.get("resource_types") or []),
+        }
+
+    def match(self, url: str, resource_type: str) -> dict | None:
+        for rule in self.rules:
+            if rule["resource_types"] and resource_type not in rule["resource_types"]:
+                continue
+            if rule["hosts"] and not rule["hosts"].search(urlsplit(url).netloc):
+                continue
+            return rule
+        return None
+
+    def handle(self, route: Route) -> None:
+        request = route.request
+        rule = self.match(request.url, request.resource_type)
+        if rule is None:
+            route.fallback()
+            return
+        stats = self.stats[rule["name"]]
+        stats["requests"] += 1
+        if self.measure_bytes:
+            try:
+                stats["bytes"] += int(route.fetch(method="HEAD").headers.get("content-length", 0))
+            except Exception as e:
+                self.log.warning(f"Could not measure blocked resource {request.url}: {e}")
+        if rule["action"] == "stub":
+            route.fulfill(status=200, body="")
+        else:
+            route.abort("blockedbyclient")
+
+    def apply(self, context: BrowserContext) -> None:
+        if self.enabled and self.rules:
+            context.route("**/*", self.handle)
+
+    def log_stats(self) -> None:
+        if not self.enabled:
+            return
+        for str_name, stats in self.stats.items():
+            str_bytes = f", bytes={stats['bytes']}" if self.measure_bytes else ""
+            self.log.info(f"Block rule '{str_name}': requests={stats['requests']}{str_bytes}")
@@ -0,0 +1,85 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import allure
+from allure_commons import plugin_manager
+from allure_commons.model2 import Attachment, ExecutableItem, ATTACHMENT_PATTERN
+from allure_commons.utils import uuid4
+from playwright.sync_api import Page
+
+from features.utils.config_manager import ConfigManager
+from features.utils.log_manager import LogManager
+
+
+class ScreenshotManager:
+    def __init__(self):
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.format = self.config.get("SCREENSHOT_FORMAT")
+        self.quality = self.config.get("SCREENSHOT_QUALITY")
+        self.scale = self.config.get("SCREENSHOT_SCALE")
+        self.attachment_type = allure.attachment_type.JPG if self.format == "jpeg" else allure.attachment_type.PNG
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-writer")
+        self.pending = []
+        self.last_digests = {}
+        self.last_screenshots = {}
+        self.stats = {"captured": 0, "skipped": 0}
+
+    def take(self, page: Page) -> bytes:
+        options = {"type": self.format, "scale": self.scale}
+        if self.format == "jpeg":
+            options["quality"] = self.quality
+        return page.screenshot(**options)
+
+    def capture(self, page: Page, test_id: str, name: str, dedupe: bool = True) -> bool:
+        screenshot = self.take(page)
+        # the latest screenshot of each test also goes into the html report
+        self.last_screenshots[test_id] = screenshot
+        str_digest = hashlib.blake2b(screenshot, digest_size=16).hexdigest()
+        if dedupe and self.last_digests.get(test_id) == str_digest:
+            self.stats["skipped"] += 1
+            self.log.info(f"Skipping screenshot '{name}': page unchanged since the previous step")
+            return False
+        self.last_digests[test_id] = str_digest
+        self.stats["captured"] += 1
+        self._attach(screenshot, name)
+        return True
+
+    @staticmethod
+    def allure_reporter():
+        for plugin in plugin_manager.get_plugins():
+            reporter = getattr(plugin, "allure_logger", None)
+            if reporter is not None:
+                return reporter
+        return None
+
+    @staticmethod
+    def register_attachment(name: str, mime_type: str, extension: str) -> str | None:
+        reporter = ScreenshotManager.allure_reporter()
+        item = reporter.get_last_item(ExecutableItem) if reporter else None
+        if item is None:
+            return None
+        str_file_name = ATTACHMENT_PATTERN.format(prefix=uuid4(), ext=extension)
+        item.attachments.append(Attachment(source=str_file_name, name=name, type=mime_type))
+        return str_file_name
+
+    def _attach(self, screenshot: bytes, name: str) -> None:
+        # register the attachment on the test thread, write the file on the background worker
+        str_file_name = self.register_attachment(name, self.attachment_type.mime_type, self.attachment_type.extension)
+        if str_file_name is not None:
+            self.pending.append(self.executor.submit(plugin_manager.hook.report_attached_data, body=screenshot, file_name=str_file_name))
+
+    def flush(self, test_id: str | None = None) -> None:
+        done, _ = wait(self.pending)
+        for future in done:
+            if future.exception():
+                self.log.error(f"Failed to write screenshot attachment: {future.exception()}")
+        self.pending = []
+        if test_id is not None:
+            self.last_digests.pop(test_id, None)
+            self.last_screenshots.pop(test_id, None)
+
+    def close(self) -> None:
+        self.flush()
+        self.executor.shutdown(wait=True)
+        self.log.info(f"Screenshot stats: captured={self.stats['captured']}, skipped={self.stats['skipped']}")
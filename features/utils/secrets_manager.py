@@ -9,7 +9,7 @@ from features.utils.log_manager import LogManager
 class SecretsManager:
 
     def __init__(self):
-        self.log = LogManager().get_logger()
+        self.log = LogManager(__name__).get_logger()
         config = ConfigManager()
         env_file = os.path.join(config.root_dir, ".env")
         load_dotenv(env_file, override=True)
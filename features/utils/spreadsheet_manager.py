@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from features.utils.log_manager import LogManager
+
+
+class SpreadsheetManager:
+    def __init__(self, file_path: str):
+        self.file = file_path
+        self.log = LogManager(__name__).get_logger()
+
+    @contextmanager
+    def _workbook(self):
+        from openpyxl import load_workbook
+        # read-only mode streams rows from the xml instead of building every cell up front
+        workbook = load_workbook(self.file, read_only=True, data_only=True)
+        try:
+            yield workbook
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _worksheet(workbook, sheet: str | None):
+        worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+        # read-only mode trusts the sheet's <dimension>, which exports often leave at A1; rescan the real extent instead
+        worksheet.reset_dimensions()
+        return worksheet
+
+    @staticmethod
+    def _location(sheet: str, int_row: int, int_column: int, value) -> dict:
+        from openpyxl.utils import get_column_letter
+        return {"sheet": sheet, "cell": f"{get_column_letter(int_column)}{int_row}", "row": int_row, "column": int_column, "value": value}
+
+    def _cells(self, workbook, sheets: list[str] | None = None):
+        for str_sheet in sheets or workbook.sheetnames:
+            for int_row, row in enumerate(self._worksheet(workbook, str_sheet).iter_rows(values_only=True), start=1):
+                for int_column, value in enumerate(row, start=1):
+                    if value is not None:
+                        yield self._location(str_sheet, int_row, int_column, value)
+
+    def cells(self, sheets: list[str] | None = None) -> list[dict]:
+        with self._workbook() as workbook:
+            return list(self._cells(workbook, sheets))
+
+    def find(self, expected_text: str, sheets: list[str] | None = None, first_only: bool = False) -> list[dict]:
+        float_start = time.perf_counter()
+        with self._workbook() as workbook:
+            matches = (cell for cell in self._cells(workbook, sheets) if expected_text in str(cell["value"]))
+            list_matches = list(islice(matches, 1) if first_only else matches)
+        self.log.info(f"Found {len(list_matches)} matches for '{expected_text}' in {os.path.basename(self.file)} "
+                      f"({(time.perf_counter() - float_start) * 1000:.0f} ms)")
+        return list_matches
+
+    def cell_value(self, cell: str, sheet: str | None = None):
+        from openpyxl.utils import coordinate_to_tuple
+        int_row, int_column = coordinate_to_tuple(cell)
+        with self._workbook() as workbook:
+            for row in self._worksheet(workbook, sheet).iter_rows(min_row=int_row, max_row=int_row, min_col=int_column,
+                                                                   max_col=int_column, values_only=True):
+                return row[0]
+        return None
+
+    def assert_cell(self, cell: str, expected, sheet: str | None = None) -> dict:
+        value = self.cell_value(cell, sheet)
+        if value != expected and str(value) != str(expected):
+            raise AssertionError(f"Cell {cell} in {os.path.basename(self.file)} is {value!r}, expected {expected!r}")
+        return {"sheet": sheet, "cell": cell, "value": value}
+
+    def column_values(self, column: str, sheet: str | None = None, header_row: int = 1) -> list:
+        from openpyxl.utils import column_index_from_string
+        with self._workbook() as workbook:
+            rows = self._worksheet(workbook, sheet).iter_rows(min_row=header_row, values_only=True)
+            header = next(rows, ())
+            if column in header:
+                int_index = header.index(column)
+            else:
+                try:
+                    int_index = column_index_from_string(column) - 1
+                except ValueError as e:
+                    raise KeyError(f"Column {column} not found in {os.path.basename(self.file)}") from e
+            return [row[int_index] if int_index < len(row) else None for row in rows]
+
+    def assert_column_contains(self, column: str, expected_values: list, sheet: str | None = None, header_row: int = 1) -> list[dict]:
+        list_values = [str(value) for value in self.column_values(column, sheet, header_row)]
+        list_missing = [expected for expected in expected_values if str(expected) not in list_values]
+        if list_missing:
+            raise AssertionError(f"Column {column} in {os.path.basename(self.file)} is missing {list_missing}")
+        return [{"column": column, "row": header_row + 1 + list_values.index(str(expected)), "value": expected} for expected in expected_values]
+
+    def row_count(self, sheet: str | None = None, header: bool = True) -> int:
+        with self._workbook() as workbook:
+            int_rows = sum(1 for row in self._worksheet(workbook, sheet).iter_rows(values_only=True)
+                           if any(value is not None for value in row))
+        return max(int_rows - 1, 0) if header else int_rows
+
+    def assert_row_count(self, expected: int, sheet: str | None = None, header: bool = True) -> int:
+        int_rows = self.row_count(sheet, header)
+        if int_rows != expected:
+            raise AssertionError(f"{os.path.basename(self.file)} has {int_rows} rows, expected {expected}")
+        return int_rows
+
+
+if __name__ == "__main__":
+    spreadsheet = SpreadsheetManager(sys.argv[1] if len(sys.argv) > 1 else os.path.join("features", "test_data", "creds.xlsx"))
+    print(spreadsheet.find("student"))
+    print(spreadsheet.assert_cell("A1", "VALID_USERNAME"))
+    print(spreadsheet.assert_column_contains("INVALID_USERNAME", ["student1", "student5"]))
+    print(spreadsheet.assert_row_count(5))
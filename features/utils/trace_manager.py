@@ -0,0 +1,43 @@
+from playwright.sync_api import BrowserContext
+
+from features.utils.config_manager import ConfigManager, is_ci
+from features.utils.log_manager import LogManager
+
+
+class TraceManager:
+    MODES = ("off", "always", "retain-on-failure")
+
+    def __init__(self):
+        self.config = ConfigManager()
+        self.log = LogManager(__name__).get_logger()
+        self.mode = "off" if is_ci() else self.config.get("TRACING")
+        if self.mode not in self.MODES:
+            raise ValueError(f"Invalid TRACING mode: {self.mode}. Expected one of {self.MODES}")
+        self.stats = {"saved": 0, "discarded": 0}
+
+    def should_trace(self) -> bool:
+        return self.mode != "off"
+
+    def start(self, context: BrowserContext, title: str) -> None:
+        # one tracing session per context, one chunk per test
+        if getattr(context, "_tracing_started", False):
+            context.tracing.start_chunk(title=title)
+        else:
+            context.tracing.start(title=title, screenshots=True, snapshots=True, sources=True)
+            context._tracing_started = True
+        self.log.info(f"Tracing chunk started for {title}")
+
+    def stop(self, context: BrowserContext, path: str, failed: bool) -> str | None:
+        if self.mode == "retain-on-failure" and not failed:
+            context.tracing.stop_chunk()
+            self.stats["discarded"] += 1
+            self.log.info("Tracing chunk discarded for passing test")
+            return None
+        context.tracing.stop_chunk(path=path)
+        self.stats["saved"] += 1
+        self.log.info(f"Tracing chunk saved to {path}")
+        return path
+
+    def log_stats(self) -> None:
+        if self.mode != "off":
+            self.log.info(f"Trace stats ({self.mode}): saved={self.stats['saved']}, discarded={self.stats['discarded']}")